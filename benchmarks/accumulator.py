@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""Contention of many threads, which report results into one score
+
+Compares BaseReturnCode.set_result, protected by a lock, with the ResultAccumulator.
+
+Usage: python benchmarks/accumulator.py [results per thread]
+"""
+
+import random
+import sys
+import threading
+import time
+
+from enhancements.returncode import BaseReturnCode
+
+
+class ScanResult(BaseReturnCode):
+    Success = BaseReturnCode.Result('success', 10)
+    Skip = BaseReturnCode.Result('skip', 11, skip=True)
+    Warning = BaseReturnCode.Result('warning', 12)
+    Error = BaseReturnCode.Result('error', 13)
+
+
+def run_threads(threads, target, results):
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        target(results)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    results = [ScanResult.convert(random.choice([10, 11, 12])) for _ in range(number)]
+    for threads in (1, 4, 16):
+        returncode = ScanResult('success')
+        lock = threading.Lock()
+
+        def locked(results):
+            for result in results:
+                with lock:
+                    returncode.set_result(result)
+
+        accumulator = ScanResult.accumulator()
+
+        def accumulate(results):
+            offer = accumulator.offer
+            for result in results:
+                offer(result)
+
+        total = threads * number
+        for name, target in (('set_result + lock', locked), ('accumulator', accumulate)):
+            seconds = run_threads(threads, target, results)
+            print('{:2} threads {:18} {:8.3f} us/result'.format(threads, name, seconds / total * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""Latency and throughput of the AsyncPipeline with many concurrent streams
+
+Each stream sends chunks through an async module, which waits for simulated I/O,
+and a synchronous module, which is run in the thread pool.
+The synchronous Pipeline processes the same streams one after another for comparison.
+
+Usage: PYTHONPATH=. python benchmarks/async_pipeline.py [streams] [chunks]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from enhancements.examples import ExampleModule
+from enhancements.modules import AsyncPipeline, Pipeline
+
+
+IO_DELAY = 0.001
+
+
+class AsyncIOModule(ExampleModule):
+
+    async def execute(self, data):
+        await asyncio.sleep(IO_DELAY)
+
+
+class BlockingIOModule(ExampleModule):
+
+    def execute(self, data):
+        time.sleep(IO_DELAY)
+
+
+class TransformModule(ExampleModule):
+
+    def execute(self, data):
+        return data[0], data[1].upper()
+
+
+def chunks(count):
+    for _ in range(count):
+        yield time.perf_counter(), b'x' * 1024
+
+
+class LatencyModule(ExampleModule):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def execute(self, data):
+        self.latencies.append(time.perf_counter() - data[0])
+
+
+def report(name, streams, chunk_count, seconds, latencies):
+    latencies = sorted(latencies)
+    print("{:<16} {:>8.0f} chunks/s   latency p50 {:>8.2f} ms   p99 {:>8.2f} ms".format(
+        name,
+        streams * chunk_count / seconds,
+        statistics.median(latencies) * 1000,
+        latencies[int(len(latencies) * 0.99)] * 1000
+    ))
+
+
+def main():
+    streams = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    chunk_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    latency = LatencyModule([])
+    pipeline = AsyncPipeline([AsyncIOModule, TransformModule, latency], args=[])
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(pipeline.run_many([chunks(chunk_count) for _ in range(streams)]))
+        report('AsyncPipeline', streams, chunk_count, time.perf_counter() - start, latency.latencies)
+    finally:
+        loop.close()
+
+    # the synchronous pipeline processes the streams sequentially, so fewer streams are used
+    sync_streams = max(1, streams // 20)
+    latency = LatencyModule([])
+    pipeline = Pipeline([BlockingIOModule, TransformModule, latency], args=[])
+    start = time.perf_counter()
+    for _ in range(sync_streams):
+        pipeline.process(chunks(chunk_count))
+    report('Pipeline', sync_streams, chunk_count, time.perf_counter() - start, latency.latencies)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+"""Startup time of the entry point discovery
+
+Compares the discovery backends with the previous implementation, which imported
+pkg_resources and iterated the entry points of a group for every lookup.
+Each measurement runs in a new interpreter, because the import time is part of the startup time.
+The time of the backends includes the import of enhancements.modules.
+
+Usage: python benchmarks/discovery.py [repeat]
+"""
+
+import os
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+
+
+LEGACY = """
+import pkg_resources
+for entry_point in pkg_resources.iter_entry_points('console_scripts'):
+    pass
+"""
+
+BACKEND = """
+from enhancements.modules import entry_point_index
+entry_point_index.group('console_scripts')
+"""
+
+
+def measure(code, repeat, **env):
+    environ = dict(os.environ, **env)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], env=environ, check=True)  # nosec
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    baseline = measure('pass', repeat)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        results = [
+            ('import enhancements.modules', measure('import enhancements.modules', repeat)),
+            ('pkg_resources (legacy)', measure(LEGACY, repeat)),
+            ('pkg_resources backend, no cache', measure(
+                BACKEND, repeat, ENHANCEMENTS_DISCOVERY_BACKEND='pkg_resources', ENHANCEMENTS_CACHE_DIR=''
+            )),
+            ('importlib backend, no cache', measure(
+                BACKEND, repeat, ENHANCEMENTS_DISCOVERY_BACKEND='importlib', ENHANCEMENTS_CACHE_DIR=''
+            )),
+            ('importlib backend, cached index', measure(
+                BACKEND, repeat, ENHANCEMENTS_DISCOVERY_BACKEND='importlib', ENHANCEMENTS_CACHE_DIR=cache_dir
+            )),
+        ]
+    print("{:<36} {:>10}".format('interpreter startup', '{:.1f} ms'.format(baseline * 1000)))
+    for name, timing in results:
+        print("{:<36} {:>10}".format(name, '{:.1f} ms'.format((timing - baseline) * 1000)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""Throughput of the HexDump module compared with the previous per byte implementation
+
+The file mode is measured with one worker and with one worker per cpu.
+
+Usage: python benchmarks/hexdump.py [size in KiB]
+"""
+
+import binascii
+import io
+import os
+import sys
+import tempfile
+import timeit
+
+from enhancements.examples import HexDump
+
+
+def legacy_hexdump(data: bytes, hexwidth: int, sink: io.StringIO) -> None:
+    # previous implementation of HexDump.execute
+    result = []
+    for i in range(0, len(data), hexwidth):
+        s = data[i:i + hexwidth]
+        hexa = list(map(''.join, zip(*[iter(binascii.hexlify(s).decode('utf-8'))] * 2)))
+        while hexwidth - len(hexa) > 0:
+            hexa.append(' ' * 2)
+        text = ''.join([chr(x) if 0x20 <= x < 0x7F else '.' for x in s])
+        addr = '%04X:    %s    %s' % (i, " ".join(hexa), text)
+        result.append(addr)
+    print('\n'.join(result), file=sink)
+
+
+def main() -> None:
+    size = int(sys.argv[1]) * 1024 if len(sys.argv) > 1 else 1024 * 1024
+    data = os.urandom(size)
+    hex_dump = HexDump([], sink=io.StringIO())
+    legacy_sink = io.StringIO()
+
+    def legacy() -> None:
+        legacy_sink.seek(0)
+        legacy_hexdump(data, 16, legacy_sink)
+
+    def renderer() -> None:
+        hex_dump.sink.seek(0)  # type: ignore
+        hex_dump.execute(data)
+
+    for name, func in (('legacy', legacy), ('renderer', renderer)):
+        seconds = min(timeit.repeat(func, number=3, repeat=3)) / 3
+        print('{:10} {:8.1f} MB/s'.format(name, size / seconds / 1e6))
+
+    with tempfile.NamedTemporaryFile() as capture:
+        capture.write(data * 16)
+        capture.flush()
+        for workers in sorted({1, os.cpu_count() or 1}):
+            file_dump = HexDump(['--hexworkers', str(workers)], sink=io.StringIO())
+
+            def dump_file() -> None:
+                file_dump.sink = io.StringIO()
+                file_dump.dump_file(capture.name)
+            seconds = min(timeit.repeat(dump_file, number=1, repeat=3))
+            print('{:10} {:8.1f} MB/s'.format('file/{}'.format(workers), size * 16 / seconds / 1e6))
+
+
+if __name__ == '__main__':
+    main()
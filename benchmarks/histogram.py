@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""Aggregation of results from forked worker processes
+
+Compares results, which are sent to the parent over a multiprocessing queue, with the ResultHistogram in shared memory.
+
+Usage: python benchmarks/histogram.py [results per worker]
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+
+from enhancements.returncode import BaseReturnCode
+
+
+class ScanResult(BaseReturnCode):
+    Success = BaseReturnCode.Result('success', 10)
+    Skip = BaseReturnCode.Result('skip', 11, skip=True)
+    Warning = BaseReturnCode.Result('warning', 12)
+    Error = BaseReturnCode.Result('error', 13)
+
+
+def send_results(queue, worker, results):
+    for result in results:
+        queue.put(int(ScanResult.convert(result)))
+    queue.put(None)
+
+
+def count_results(histogram, worker, results):
+    add = histogram.add
+    for result in results:
+        add(result, worker)
+
+
+def run(context, workers, target, shared, results):
+    processes = [context.Process(target=target, args=(shared, worker, results)) for worker in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    if target is send_results:
+        returncode = ScanResult('success')
+        finished = 0
+        while finished < workers:
+            result = shared.get()
+            if result is None:
+                finished += 1
+            else:
+                returncode.set_result(result)
+    for process in processes:
+        process.join()
+    return time.perf_counter() - start
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    context = multiprocessing.get_context('fork')
+    results = [random.choice([10, 11, 12]) for _ in range(number)]
+    for workers in (1, 4):
+        total = workers * number
+        seconds = run(context, workers, send_results, context.Queue(), results)
+        print('{} workers {:10} {:8.3f} us/result'.format(workers, 'queue', seconds / total * 1e6))
+        with ScanResult.histogram(workers) as histogram:
+            seconds = run(context, workers, count_results, histogram, results)
+            print('{} workers {:10} {:8.3f} us/result'.format(workers, 'histogram', seconds / total * 1e6))
+
+
+if __name__ == '__main__':
+    main()
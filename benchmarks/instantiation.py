@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""Cost of creating module instances with the same argv
+
+Compares the template based instantiation with parsing the arguments for every instance.
+
+Usage: python benchmarks/instantiation.py [number]
+"""
+
+import argparse
+import sys
+import timeit
+
+from enhancements.examples import HexDump
+
+
+ARGV = ['--hexwidth', '16']
+
+
+def parse_every_time() -> None:
+    # equivalent of the previous BaseModule.__init__
+    HexDump(ARGV, argparse.Namespace())
+
+
+def from_template() -> None:
+    HexDump(ARGV)
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for name, func in (('parse', parse_every_time), ('template', from_template)):
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print('{:10} {:8.2f} us/instance'.format(name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
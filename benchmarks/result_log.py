@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""Memory and scoring time of a list of results compared to a ResultLog
+
+The list contains a new Result object for each entry, like results which were received from another process.
+
+Usage: python benchmarks/result_log.py [number]
+"""
+
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+from enhancements.returncode import BaseReturnCode
+
+
+class ScanResult(BaseReturnCode):
+    Success = BaseReturnCode.Result('success', 10)
+    Skip = BaseReturnCode.Result('skip', 11, skip=True)
+    Warning = BaseReturnCode.Result('warning', 12)
+    Error = BaseReturnCode.Result('error', 13)
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, seconds
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    codes = [random.choice([10, 11, 12]) for _ in range(number)]
+    results = {int(result): result for result in ScanResult.get_results().values()}
+    result_list, list_size, _ = measure(
+        lambda: [ScanResult.Result(results[code].string, code, results[code].skip) for code in codes]
+    )
+    log, log_size, _ = measure(lambda: ScanResult.result_log(codes))
+    print('list of results {:8.1f} bytes/result'.format(list_size / number))
+    print('ResultLog       {:8.1f} bytes/result'.format(log_size / number))
+
+    for name, func in (('get_score', lambda: ScanResult.get_score(*result_list)), ('ResultLog.score', log.score)):
+        seconds = min(timeit.repeat(func, number=1, repeat=5))
+        print('{:15} {:8.3f} us/result'.format(name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+"""Cost of comparisons between results of a BaseReturnCode and of the bulk scoring
+
+Usage: python benchmarks/returncode.py [number]
+"""
+
+import random
+import sys
+import timeit
+
+from enhancements.returncode import BaseReturnCode
+
+
+class ScanResult(BaseReturnCode):
+    Success = BaseReturnCode.Result('success', 10)
+    Skip = BaseReturnCode.Result('skip', 11, skip=True)
+    Warning = BaseReturnCode.Result('warning', 12)
+    Error = BaseReturnCode.Result('error', 13)
+
+
+def main() -> None:
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    results = [ScanResult.Success, ScanResult.Warning, ScanResult.Error, ScanResult.Skip] * 250
+    benchmarks = (
+        ('Result < Result', lambda: ScanResult.Success < ScanResult.Error),
+        ('Result == Result', lambda: ScanResult.Error == ScanResult.Error),
+        ('Result == int', lambda: ScanResult.Error == 13),
+        ('Result == str', lambda: ScanResult.Error == 'error'),
+        ('get_score (1000)', lambda: ScanResult.get_score(*results)),
+    )
+    for name, func in benchmarks:
+        calls = max(number // 1000, 10) if name.startswith('get_score') else number
+        seconds = min(timeit.repeat(func, number=calls, repeat=5)) / calls
+        print('{:20} {:10.3f} us'.format(name, seconds * 1e6))
+
+    codes = [random.choice([10, 11, 12, 13]) for _ in range(1000000)]
+    hosts = [random.randrange(1000) for _ in range(len(codes))]
+    results = [ScanResult.convert(code) for code in codes]
+    bulk_benchmarks = [
+        ('get_score (1M)', lambda: ScanResult.get_score(*results)),
+        ('get_bulk_score (1M)', lambda: ScanResult.get_bulk_score(codes)),
+        ('get_group_scores (1M)', lambda: ScanResult.get_group_scores(codes, hosts)),
+    ]
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        pass
+    else:
+        code_array = numpy.array(codes, dtype=numpy.int8)
+        host_array = numpy.array(hosts)
+        bulk_benchmarks.extend([
+            ('get_bulk_score (array)', lambda: ScanResult.get_bulk_score(code_array)),
+            ('get_group_scores (array)', lambda: ScanResult.get_group_scores(code_array, host_array)),
+        ])
+    for name, func in bulk_benchmarks:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print('{:25} {:8.1f} ms'.format(name, seconds * 1e3))
+
+
+if __name__ == '__main__':
+    main()
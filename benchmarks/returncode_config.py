@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""Import time of a module with a BaseReturnCode class, which uses a CONFIGFILE
+
+Each measurement runs in a new interpreter. The package of the return code class is created in a temporary directory.
+
+Usage: python benchmarks/returncode_config.py [repeat]
+"""
+
+import os
+import subprocess  # nosec
+import sys
+import tempfile
+
+RETURNCODE_INI = """
+[Result]
+initial = success
+"""
+
+RESULT_SECTION = """
+[Result:result{0}]
+value = {0}
+skip = False
+"""
+
+CODE = """
+import time
+start = time.perf_counter()
+import enhancements.returncode
+imported = time.perf_counter()
+import scanner.codes
+defined = time.perf_counter()
+scanner.codes.ScanResult.max()
+print(imported - start, defined - imported, time.perf_counter() - defined)
+"""
+
+
+def measure(tmpdir, repeat):
+    env = dict(
+        os.environ, PYTHONPATH=os.pathsep.join([tmpdir, os.getcwd()]), ENHANCEMENTS_CACHE_DIR=os.path.join(tmpdir, 'cache')
+    )
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', CODE], check=True, stdout=subprocess.PIPE, env=env)  # nosec
+        timings.append([float(value) for value in output.stdout.split()])
+    return [min(column) for column in zip(*timings)]
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, 'scanner', 'data'))
+        with open(os.path.join(tmpdir, 'scanner', '__init__.py'), 'w'):
+            pass
+        with open(os.path.join(tmpdir, 'scanner', 'codes.py'), 'w') as codes:
+            codes.write('from enhancements.returncode import BaseReturnCode\n\n\n')
+            codes.write('class ScanResult(BaseReturnCode):\n    CONFIGFILE = "returncode.ini"\n')
+        with open(os.path.join(tmpdir, 'scanner', 'data', 'returncode.ini'), 'w') as configfile:
+            configfile.write(RETURNCODE_INI + ''.join(RESULT_SECTION.format(value) for value in range(50)))
+        imported, defined, used = measure(tmpdir, repeat)
+        print('import enhancements.returncode {:8.2f} ms'.format(imported * 1e3))
+        print('import module with CONFIGFILE  {:8.2f} ms'.format(defined * 1e3))
+        print('first use of the results       {:8.2f} ms'.format(used * 1e3))
+
+
+if __name__ == '__main__':
+    main()
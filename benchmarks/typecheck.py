@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""Per call cost of the runtime type checking modes
+
+Each mode runs in a new interpreter, because the mode is applied when the modules are imported.
+
+Usage: python benchmarks/typecheck.py [number]
+"""
+
+import json
+import os
+import subprocess  # nosec
+import sys
+
+
+MODES = ('off', 'sampled', 'full')
+
+MEASURE = """
+import json
+import sys
+import timeit
+
+from enhancements.examples import ExampleModule, HexDump
+from enhancements.modules import ModuleParser
+from enhancements.returncode import BaseReturnCode
+
+
+class ScanResult(BaseReturnCode):
+    Success = BaseReturnCode.Result('success', 10)
+    Error = BaseReturnCode.Result('error', 12)
+
+
+parser = ModuleParser(baseclass=ExampleModule)
+statements = {
+    'Result.__eq__': (lambda: ScanResult.Success == ScanResult.Error, 1),
+    'BaseReturnCode.convert': (lambda: ScanResult.convert('error'), 1),
+    'BaseModule.parser': (HexDump.parser, 1),
+    'BaseModule.modules': (HexDump.modules, 1),
+    'ModuleParser.parse_args': (lambda: parser.parse_args(['-m', 'enhancements.examples.HexDump']), 100),
+}
+number = int(sys.argv[1])
+print(json.dumps({
+    name: min(timeit.repeat(statement, number=number // divisor, repeat=5)) / (number // divisor)
+    for name, (statement, divisor) in statements.items()
+}))
+"""
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    results = {}
+    for mode in MODES:
+        output = subprocess.run(  # nosec
+            [sys.executable, '-c', MEASURE, str(number)],
+            env=dict(os.environ, ENHANCEMENTS_TYPECHECK=mode),
+            stdout=subprocess.PIPE,
+            check=True
+        ).stdout
+        results[mode] = json.loads(output.decode('utf-8'))
+
+    print("{:<26}".format('per call') + "".join("{:>14}".format(mode) for mode in MODES))
+    for name in results[MODES[0]]:
+        print("{:<26}".format(name) + "".join(
+            "{:>14}".format('{:.2f} us'.format(results[mode][name] * 1000000)) for mode in MODES
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+"""On-disk cache used to speed up the startup of applications
+
+All caches are stored as json files in a common cache directory. Each file contains
+a key, which must match the current key, otherwise the cached data is ignored.
+
+The cache directory defaults to ``$XDG_CACHE_HOME/enhancements`` and can be changed with the
+environment variable ``ENHANCEMENTS_CACHE_DIR``. Setting this variable to an empty value
+disables all on-disk caches.
+"""
+
+import json
+import logging
+import os
+from typing import (
+    Any,
+    Optional,
+    Text
+)
+
+
+CACHE_DIR_ENV: Text = 'ENHANCEMENTS_CACHE_DIR'
+
+
+def get_cache_dir() -> Optional[Text]:
+    """returns the cache directory or None if the on-disk cache is disabled
+    """
+    if CACHE_DIR_ENV in os.environ:
+        return os.environ[CACHE_DIR_ENV] or None
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'enhancements')
+
+
+def read_cache(name: Text, key: Text) -> Optional[Any]:
+    """read data from the cache file "name"
+
+    None is returned, if the cache is disabled, the file does not exist or was stored with another key.
+    """
+    cache_dir = get_cache_dir()
+    if not cache_dir:
+        return None
+    try:
+        with open(os.path.join(cache_dir, name), 'r', encoding='utf-8') as cache_file:
+            content = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(content, dict) or content.get('key') != key:
+        return None
+    return content.get('data')
+
+
+def write_cache(name: Text, key: Text, data: Any) -> bool:
+    """store json serializable data in the cache file "name"
+
+    The file is replaced atomically, so concurrent processes never read a partially written cache.
+    """
+    cache_dir = get_cache_dir()
+    if not cache_dir:
+        return False
+    import tempfile  # pylint: disable=import-outside-toplevel
+    cache_file = os.path.join(cache_dir, name)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix='.tmp')
+        try:
+            with os.fdopen(tmp_fd, 'w', encoding='utf-8') as tmp_file:
+                json.dump({'key': key, 'data': data}, tmp_file)
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except (OSError, TypeError, ValueError):
+        logging.debug("unable to write cache file %s", cache_file, exc_info=True)
+        return False
+    return True
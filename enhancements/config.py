@@ -4,8 +4,6 @@ from configparser import ConfigParser
 import inspect
 import logging
 import os
-import pickle  # nosec
-import pkg_resources
 from typing import (
     cast,
     Any,
@@ -16,7 +14,7 @@ from typing import (
     Type
 )
 
-from enhancements.modules import get_module_class, BaseModule
+from enhancements.modules import entry_point_index, get_module_class, BaseModule
 
 
 class DefaultConfigNotFound(Exception):
@@ -66,7 +64,7 @@ class ExtendedConfigParser(ConfigParser):
                 packages.append(frame_packagename)
                 break
         for packagename in packages:
-            defaultconfig = pkg_resources.resource_filename(packagename, '/'.join(('data', self.defaultini)))
+            defaultconfig = entry_point_index.resource_filename(packagename, '/'.join(('data', self.defaultini)))
             if os.path.isfile(defaultconfig):
                 return defaultconfig
         if not self.ignore_missing_default_config:
@@ -89,6 +87,7 @@ class ExtendedConfigParser(ConfigParser):
     def copy(self) -> 'ExtendedConfigParser':
         """ create a copy of the current config
         """
+        import pickle  # nosec # pylint: disable=import-outside-toplevel
         return cast('ExtendedConfigParser', pickle.loads(pickle.dumps(self)))  # nosec
 
     def append(self, configpath: Text) -> None:
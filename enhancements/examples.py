@@ -1,11 +1,19 @@
 # -*- coding: utf-8 -*-
 
-import binascii
+import argparse
+import collections
+import mmap
+import os
+import sys
 
 from typing import (
+    Any,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
     Text,
-    Union,
-    Optional
+    Union
 )
 
 from enhancements.modules import BaseModule
@@ -17,7 +25,86 @@ class ExampleModule(BaseModule):
         pass
 
 
+class HexDumpRenderer():
+    """Renders hexdumps of many lines at once
+
+    The hex column of all lines is created with a single ``bytes.hex`` call and the text column
+    with a translate table, so only slicing and formatting is done per line.
+    """
+
+    ASCII_TABLE: bytes = bytes(char if 0x20 <= char < 0x7F else ord('.') for char in range(256))
+
+    def __init__(self, width: int = 16, address_width: int = 4) -> None:
+        if width < 1:
+            raise ValueError('width of the hexdump must be greater than 0')
+        self.width: int = width
+        self.address_width: int = address_width
+
+    @staticmethod
+    def hexlify(data: bytes) -> Text:
+        """hex representation of the data, the bytes are separated by spaces"""
+        if sys.version_info >= (3, 8):
+            return data.hex(' ')
+        hexa = data.hex()
+        return ' '.join([hexa[pos:pos + 2] for pos in range(0, len(hexa), 2)])
+
+    def lines(self, data: bytes, offset: int = 0) -> List[Text]:
+        width = self.width
+        address_width = self.address_width
+        step = width * 3
+        hexa = self.hexlify(data)
+        text = data.translate(self.ASCII_TABLE).decode('ascii')
+        lines = [
+            '%0*X:    %s    %s' % (
+                address_width, offset + pos, hexa[line * step:line * step + step - 1], text[pos:pos + width]
+            )
+            for line, pos in enumerate(range(0, len(data), width))
+        ]
+        if len(data) % width:
+            # pad the hex column of the last line, so the text column is aligned
+            pos = len(data) - len(data) % width
+            lines[-1] = '%0*X:    %s    %s' % (address_width, offset + pos, hexa[pos * 3:].ljust(step - 1), text[pos:])
+        return lines
+
+    def render(self, data: bytes, offset: int = 0) -> Text:
+        return '\n'.join(self.lines(data, offset))
+
+
+_worker_file: Optional[mmap.mmap] = None
+_worker_path: Optional[Text] = None
+
+
+def _init_file_worker(path: Text) -> None:
+    global _worker_file, _worker_path  # pylint: disable=global-statement
+    with open(path, 'rb') as dump_file:
+        _worker_file = mmap.mmap(dump_file.fileno(), 0, access=mmap.ACCESS_READ)
+    _worker_path = path
+
+
+def _render_file_chunk(path: Text, offset: int, size: int, width: int, address_width: int) -> Text:
+    # the file is mapped on the first chunk, because ProcessPoolExecutor has no initializer before Python 3.7
+    if _worker_file is None or _worker_path != path:
+        _init_file_worker(path)
+    return HexDumpRenderer(width, address_width).render(_worker_file[offset:offset + size], offset)  # type: ignore
+
+
+def _workers_argument(value: Text) -> int:
+    workers = int(value)
+    if workers < 0:
+        raise argparse.ArgumentTypeError('number of workers must not be negative: {}'.format(value))
+    return workers
+
+
 class HexDump(ExampleModule):
+    """Writes a hexdump of the data to a sink (default: stdout)"""
+
+    # files of this size and larger are rendered by multiple processes, if --hexworkers is not set
+    PARALLEL_THRESHOLD: int = 16 * 1024 * 1024
+
+    def __init__(self, *args: Any, sink: Optional[TextIO] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.sink: Optional[TextIO] = sink
+        self.renderer: HexDumpRenderer = HexDumpRenderer(self.args.hexwidth, self.args.hexaddresswidth)
 
     @classmethod
     def parser_arguments(cls) -> None:
@@ -30,21 +117,75 @@ class HexDump(ExampleModule):
             default=16,
             help='width of the hexdump in chars'
         )
+        cls.parser().add_argument(
+            '--hexaddress-width',
+            dest='hexaddresswidth',
+            type=int,
+            default=4,
+            help='minimum number of hex digits of the addresses'
+        )
+        cls.parser().add_argument(
+            '--hexworkers',
+            dest='hexworkers',
+            type=_workers_argument,
+            default=None,
+            help='number of processes to render files, 0 uses all cpus '
+                 '(default: 1 for files smaller than 16 MiB, otherwise all cpus)'
+        )
 
     def execute(self, data: Union[bytes, Text]) -> Optional[Union[bytes, Text]]:
-        result = []
-
         if isinstance(data, str):
             data = bytes(data, 'UTF-8')
+        if (self.renderer.width, self.renderer.address_width) != (self.args.hexwidth, self.args.hexaddresswidth):
+            self.renderer = HexDumpRenderer(self.args.hexwidth, self.args.hexaddresswidth)
+        # stdout is resolved on every call, because it can be replaced after the module was created
+        sink = self.sink or sys.stdout
+        sink.write(self.renderer.render(data) + '\n')
+        return data
 
-        for i in range(0, len(data), self.args.hexwidth):
-            s = data[i:i + self.args.hexwidth]
-            hexa = list(map(''.join, zip(*[iter(binascii.hexlify(s).decode('utf-8'))] * 2)))
-            while self.args.hexwidth - len(hexa) > 0:
-                hexa.append(' ' * 2)
-            text = ''.join([chr(x) if 0x20 <= x < 0x7F else '.' for x in s])
-            addr = '%04X:    %s    %s' % (i, " ".join(hexa), text)
-            result.append(addr)
+    def iter_file(self, path: Text, start: int = 0, length: Optional[int] = None, chunk_lines: int = 4096) -> Iterator[Text]:
+        """render a range of a file in parallel processes and yield the rendered chunks in order
 
-        print('\n'.join(result))
-        return data
+        The file is memory mapped by each worker process and the addresses are the offsets in the file.
+        Only a few chunks per worker are rendered ahead, so the memory usage does not depend on the file size.
+        """
+        end = os.path.getsize(path)
+        if length is not None:
+            end = min(end, start + length)
+        if start >= end:
+            return
+        chunk_size = chunk_lines * self.args.hexwidth
+        ranges = ((offset, min(chunk_size, end - offset)) for offset in range(start, end, chunk_size))
+        workers = self.args.hexworkers
+        if workers is None:
+            # starting worker processes takes longer than rendering a small file
+            workers = 1 if end - start < self.PARALLEL_THRESHOLD else 0
+        workers = min(workers or os.cpu_count() or 1, -(-(end - start) // chunk_size))
+        if workers == 1:
+            renderer = HexDumpRenderer(self.args.hexwidth, self.args.hexaddresswidth)
+            with open(path, 'rb') as dump_file, mmap.mmap(dump_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                for offset, size in ranges:
+                    yield renderer.render(data[offset:offset + size], offset)
+            return
+
+        import concurrent.futures  # pylint: disable=import-outside-toplevel
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: 'collections.deque[concurrent.futures.Future[Text]]' = collections.deque()
+            try:
+                for offset, size in ranges:
+                    if len(pending) >= workers * 2:
+                        yield pending.popleft().result()
+                    pending.append(executor.submit(
+                        _render_file_chunk, path, offset, size, self.args.hexwidth, self.args.hexaddresswidth
+                    ))
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def dump_file(self, path: Text, start: int = 0, length: Optional[int] = None) -> None:
+        """write the hexdump of a range of a file to the sink"""
+        sink = self.sink or sys.stdout
+        for chunk in self.iter_file(path, start, length):
+            sink.write(chunk + '\n')
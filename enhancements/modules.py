@@ -23,34 +23,54 @@ Alle anderen Klassen und Funktionen in diesem Modul sind entweder aus Legacy Gr
 implemntationsspezifisch und sollten in Produktivanwendungen nicht verwendet werden.
 """
 
+import functools
+import hashlib
 import os
 import sys
 import types
 import importlib
+import importlib.machinery
+import importlib.util
 import logging
 import argparse
+import collections
+import contextlib
+import copy
 import inspect
-import traceback
+import json
+import threading
+import time
 from types import ModuleType
-import pkg_resources
-import argcomplete
-
-from typeguard import typechecked
 
 from typing import (
     cast,
+    TYPE_CHECKING,
     Any,
+    AsyncIterator,
+    Callable,
     List,
+    Mapping,
+    NamedTuple,
     Optional, Sequence,
     Tuple,
     Dict,
+    Iterable,
+    Iterator,
     Type,
-    Set,
     Text,
     Union
 )
 
+from enhancements.__version__ import version as enhancements_version
+from enhancements.cache import read_cache, write_cache
 from enhancements.exceptions import ModuleFromFileException
+from enhancements.typecheck import typechecked
+
+if TYPE_CHECKING:
+    # imported on demand, because these modules are only needed by a few code paths
+    import asyncio
+    import concurrent.futures
+    import queue
 
 
 @typechecked
@@ -70,6 +90,139 @@ def _split_module_string(modulearg: Text, moduleloader: Optional['ModuleParser']
     return modname, funcname
 
 
+HOT_RELOAD_ENV: Text = 'ENHANCEMENTS_HOT_RELOAD'
+
+
+class FileModuleCache():
+    """Cache for modules, which are loaded from files
+
+    Each module is cached with the modification time and the size of its file.
+    Without hot reload, a file is executed only once. With hot reload, the file is checked on every lookup
+    and executed again if it was changed. The new module replaces the cached module and the entry in sys.modules
+    only after it was executed successfully, so concurrent lookups never get a partially initialized module.
+    """
+
+    def __init__(self, hot_reload: bool = False) -> None:
+        self.hot_reload: bool = hot_reload
+        self._modules: Dict[Text, Tuple[int, int, ModuleType]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def module_name(path: Text) -> Text:
+        return 'enhanced_moduleloader_{}'.format(path)
+
+    def get(self, path: Text) -> ModuleType:
+        path = os.path.abspath(path)
+        with self._lock:
+            cached = self._modules.get(path)
+            if cached is not None and not self.hot_reload:
+                return cached[2]
+            stat = os.stat(path)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                return cached[2]
+            modname = self.module_name(path)
+            if cached is None and modname in sys.modules and not self.hot_reload:
+                logging.debug("using already imported module %s", modname)
+                return sys.modules[modname]
+            try:
+                module = self._exec_module(modname, path)
+            except Exception:
+                if cached is None:
+                    raise
+                logging.exception("reloading module %s failed, using previous version", path)
+                return cached[2]
+            if cached is not None:
+                logging.info("reloaded module %s", path)
+            self._modules[path] = (stat.st_mtime_ns, stat.st_size, module)
+            sys.modules[modname] = module
+            return module
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._modules:
+                sys.modules.pop(self.module_name(path), None)
+            self._modules.clear()
+
+    @staticmethod
+    def _exec_module(modname: Text, path: Text) -> ModuleType:
+        logging.warning('Loading modules from files is not recommended! Please use a python package instead.')
+        loader = importlib.machinery.SourceFileLoader(modname, path)
+        module: ModuleType = types.ModuleType(loader.name)
+        module.__file__ = path
+        loader.exec_module(module)
+        return module
+
+
+file_module_cache = FileModuleCache(hot_reload=os.environ.get(HOT_RELOAD_ENV, '') not in ('', '0'))
+
+
+def _get_option_values(argv: Sequence[Text], option: Text) -> List[Text]:
+    """returns the values of an option from the command line arguments"""
+    values = []
+    for index, token in enumerate(argv):
+        if token == option and index + 1 < len(argv):
+            values.append(argv[index + 1])
+        elif token.startswith(option + '='):
+            values.append(token.split('=', 1)[1])
+    return values
+
+
+class ModulePrefetcher():
+    """Imports modules in a background thread pool
+
+    The ModuleParser starts the imports as soon as the module names are known from the command line.
+    When a module class is needed, :meth:`wait` blocks until the import of the module is finished.
+    Modules, which are mostly blocked on I/O during import, are imported concurrently.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        self.max_workers: Optional[int] = max_workers
+        self.import_times: Dict[Text, float] = {}
+        self._futures: Dict[Text, 'concurrent.futures.Future[float]'] = {}
+        self._executor: Optional['concurrent.futures.ThreadPoolExecutor'] = None
+
+    def prefetch(self, modname: Text) -> None:
+        if modname in sys.modules or modname in self._futures:
+            return
+        if self._executor is None:
+            import concurrent.futures  # pylint: disable=import-outside-toplevel
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='ModulePrefetcher'
+            )
+        self._futures[modname] = self._executor.submit(self._import_module, modname)
+
+    @staticmethod
+    def _import_module(modname: Text) -> float:
+        start = time.perf_counter()
+        importlib.import_module(modname)
+        return time.perf_counter() - start
+
+    def wait(self, modname: Text) -> None:
+        """wait until a prefetched module is imported
+
+        Errors are not raised, because the module is imported again by the caller, which reports the error.
+        """
+        future = self._futures.get(modname)
+        if future is not None:
+            import concurrent.futures  # pylint: disable=import-outside-toplevel
+            concurrent.futures.wait([future])
+
+    def join(self) -> Dict[Text, float]:
+        """wait for all imports and return the import time of each prefetched module"""
+        for modname, future in self._futures.items():
+            try:
+                self.import_times[modname] = future.result()
+                logging.debug("prefetched module %s in %.3f s", modname, self.import_times[modname])
+            except Exception:
+                logging.debug("prefetching module %s failed", modname, exc_info=True)
+        self._futures.clear()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        return self.import_times
+
+
 @typechecked
 def _load_module_from_string(modname: Text, modules_from_file: bool = False) -> ModuleType:
     """Prüfen, ob das Modul von einem Package oder einer Datei geladen werden soll
@@ -83,16 +236,7 @@ def _load_module_from_string(modname: Text, modules_from_file: bool = False) ->
     if not modules_from_file:
         raise ModuleFromFileException('loading a module from a file is not allowed')
 
-    modname_file = 'enhanced_moduleloader_{}'.format(modname)
-    if modname_file in sys.modules:
-        logging.debug("using already imported module %s", modname_file)
-        return sys.modules[modname_file]
-
-    logging.warning('Loading modules from files is not recommended! Please use a python package instead.')
-    loader = importlib.machinery.SourceFileLoader(modname_file, modname)
-    module: ModuleType = types.ModuleType(loader.name)
-    loader.exec_module(module)
-    return module
+    return file_module_cache.get(modname)
 
 
 @typechecked
@@ -107,6 +251,18 @@ def _get_valid_module_class(module: ModuleType, funcname: Text) -> Type['BaseMod
     return handlerclass
 
 
+def _load_module_class(
+    modulearg: Text, moduleloader: Optional['ModuleParser'], modules_from_file: bool
+) -> Type['BaseModule']:
+    """load a module class from a string, modules, which are prefetched by the moduleloader, are awaited first"""
+    modname, funcname = _split_module_string(modulearg, moduleloader)
+    if moduleloader is not None and moduleloader.prefetcher is not None:
+        moduleloader.prefetcher.wait(modname)
+    files_allowed = modules_from_file or (moduleloader is not None and moduleloader.modules_from_file)
+    module = _load_module_from_string(modname, files_allowed)
+    return _get_valid_module_class(module, funcname)
+
+
 @typechecked
 def get_module_class(modulelist: Union[Type['BaseModule'], Text, Sequence[Union[Text, Type['BaseModule']]]], moduleloader: Optional['ModuleParser'] = None, modules_from_file: bool = False) -> List[Type['BaseModule']]:
     """Lädt eine Klasse anhand eines Strings.
@@ -129,10 +285,7 @@ def get_module_class(modulelist: Union[Type['BaseModule'], Text, Sequence[Union[
 
         for modulearg in modulelist_it:
             if isinstance(modulearg, str):
-                modname, funcname = _split_module_string(modulearg, moduleloader)
-                files_allowed = modules_from_file or (moduleloader is not None and moduleloader.modules_from_file)
-                module = _load_module_from_string(modname, files_allowed)
-                handlerclass = _get_valid_module_class(module, funcname)
+                handlerclass = _load_module_class(modulearg, moduleloader, modules_from_file)
                 if handlerclass:
                     modules.append(handlerclass)
             elif inspect.isclass(modulearg) and issubclass(modulearg, BaseModule):
@@ -144,68 +297,415 @@ def get_module_class(modulelist: Union[Type['BaseModule'], Text, Sequence[Union[
         raise ModuleError
     except Exception:
         # in case of an exception delete all loaded modules
+        import traceback  # pylint: disable=import-outside-toplevel
         raise ModuleError(message=traceback.format_exc())
     return modules
 
 
+class EntryPoint(NamedTuple):
+    """Entry point of an installed distribution
+
+    In contrast to the entry points of pkg_resources, this class only stores strings,
+    so it can be written to the entry point cache.
+    """
+    name: Text
+    group: Text
+    value: Text
+
+    @property
+    def module_name(self) -> Text:
+        return self.value.split(':', 1)[0].strip()
+
+    @property
+    def attr(self) -> Text:
+        return self.value.partition(':')[2].split('[', 1)[0].strip()
+
+    def load(self) -> Any:
+        obj: Any = importlib.import_module(self.module_name)
+        for attrname in filter(None, self.attr.split('.')):
+            obj = getattr(obj, attrname)
+        return obj
+
+
+class EntryPointBackend():
+    """Base class for backends, which discover entry points and resources of installed packages
+    """
+
+    NAME: Text = ''
+
+    def iter_entry_points(self) -> Iterator[EntryPoint]:
+        raise NotImplementedError
+
+    def resource_filename(self, package: Text, resource: Text) -> Text:
+        raise NotImplementedError
+
+
+class ImportlibMetadataBackend(EntryPointBackend):
+    """Discovery backend based on importlib.metadata (Python 3.8+)
+
+    This backend avoids the expensive import of pkg_resources.
+    """
+
+    NAME = 'importlib'
+
+    def iter_entry_points(self) -> Iterator[EntryPoint]:
+        from importlib import metadata  # pylint: disable=import-outside-toplevel
+        for dist in metadata.distributions():
+            for entry_point in dist.entry_points:
+                yield EntryPoint(entry_point.name, entry_point.group, entry_point.value)
+
+    def resource_filename(self, package: Text, resource: Text) -> Text:
+        module = sys.modules.get(package)
+        origin: Optional[Text] = getattr(module, '__file__', None)
+        if origin is None:
+            try:
+                spec = importlib.util.find_spec(package)
+            except (ImportError, ValueError):
+                spec = None
+            if spec is None:
+                # like pkg_resources, a module without a location (e.g. __main__ of "python -c") returns a relative path
+                return os.path.join(*resource.split('/'))
+            if spec.has_location and spec.origin:
+                origin = spec.origin
+            elif spec.submodule_search_locations:
+                # namespace packages have no origin, so the first package directory is used
+                origin = os.path.join(list(spec.submodule_search_locations)[0], '__init__.py')
+            else:
+                origin = os.path.join(os.getcwd(), package)
+        return os.path.join(os.path.dirname(origin), *resource.split('/'))
+
+
+class PkgResourcesBackend(EntryPointBackend):
+    """Discovery backend based on pkg_resources, which is used for Python versions without importlib.metadata
+    """
+
+    NAME = 'pkg_resources'
+
+    def iter_entry_points(self) -> Iterator[EntryPoint]:
+        import pkg_resources  # pylint: disable=import-outside-toplevel
+        for dist in pkg_resources.working_set:
+            for group, entry_points in dist.get_entry_map().items():
+                for name, entry_point in entry_points.items():
+                    value = entry_point.module_name
+                    if entry_point.attrs:
+                        value += ':' + '.'.join(entry_point.attrs)
+                    yield EntryPoint(name, group, value)
+
+    def resource_filename(self, package: Text, resource: Text) -> Text:
+        import pkg_resources  # pylint: disable=import-outside-toplevel
+        return cast(Text, pkg_resources.resource_filename(package, resource))
+
+
+DISCOVERY_BACKEND_ENV: Text = 'ENHANCEMENTS_DISCOVERY_BACKEND'
+DISCOVERY_BACKENDS: Dict[Text, Type[EntryPointBackend]] = {
+    ImportlibMetadataBackend.NAME: ImportlibMetadataBackend,
+    PkgResourcesBackend.NAME: PkgResourcesBackend
+}
+
+
+def get_default_backend() -> EntryPointBackend:
+    """returns the backend from the environment variable ENHANCEMENTS_DISCOVERY_BACKEND
+
+    If the variable is not set, importlib.metadata is used when it is available.
+    """
+    backend_name = os.environ.get(DISCOVERY_BACKEND_ENV)
+    if backend_name:
+        if backend_name not in DISCOVERY_BACKENDS:
+            raise ValueError('unknown discovery backend {}! Valid backends are: {}'.format(
+                backend_name,
+                ", ".join(DISCOVERY_BACKENDS)
+            ))
+        return DISCOVERY_BACKENDS[backend_name]()
+    if sys.version_info >= (3, 8):
+        return ImportlibMetadataBackend()
+    return PkgResourcesBackend()
+
+
+class EntryPointIndex():
+    """Index of all installed entry points, grouped by entry point group and name
+
+    All entry points are read in a single pass over the installed distributions.
+    Scanning the distributions is expensive, so the index is built only once per process
+    and stored in the cache directory. The stored index is used as long as the entries in sys.path
+    and the modification times of the distribution metadata did not change.
+    """
+
+    CACHEFILE: Text = 'entrypoints.json'
+
+    def __init__(self, backend: Optional[EntryPointBackend] = None) -> None:
+        self._backend: Optional[EntryPointBackend] = backend
+        self._index: Optional[Dict[Text, Dict[Text, EntryPoint]]] = None
+
+    @property
+    def backend(self) -> EntryPointBackend:
+        if self._backend is None:
+            self._backend = get_default_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: EntryPointBackend) -> None:
+        self._backend = backend
+        self.invalidate()
+
+    @property
+    def index(self) -> Dict[Text, Dict[Text, EntryPoint]]:
+        if self._index is None:
+            self._index = self._load()
+        return self._index
+
+    def invalidate(self) -> None:
+        """discard the index, so it will be loaded again on the next access"""
+        self._index = None
+
+    def group(self, group: Text) -> Dict[Text, EntryPoint]:
+        return self.index.get(group, {})
+
+    def get(self, group: Text, name: Text) -> Optional[EntryPoint]:
+        """returns an entry point by name or by the name of the module"""
+        entry_points = self.group(group)
+        entry_point = entry_points.get(name)
+        if entry_point is not None:
+            return entry_point
+        for entry_point in entry_points.values():
+            if entry_point.module_name == name:
+                return entry_point
+        return None
+
+    def resource_filename(self, package: Text, resource: Text) -> Text:
+        return self.backend.resource_filename(package, resource)
+
+    @staticmethod
+    def cache_key() -> Text:
+        """checksum over sys.path and the modification times of all distribution metadata
+
+        Installing, upgrading or removing a distribution changes the checksum, which invalidates the stored index.
+        """
+        checksum = hashlib.sha256(sys.version.encode('utf-8'))
+        for path in sys.path:
+            checksum.update(path.encode('utf-8', 'surrogateescape') + b'\0')
+            try:
+                entries = sorted(os.listdir(path or os.curdir))
+            except OSError:
+                if os.path.isfile(path):
+                    checksum.update(str(os.stat(path).st_mtime_ns).encode('utf-8'))
+                continue
+            for entry in entries:
+                if not entry.endswith(('.dist-info', '.egg-info', '.egg-link', '.pth')):
+                    continue
+                for filename in (entry, os.path.join(entry, 'entry_points.txt')):
+                    try:
+                        mtime = os.stat(os.path.join(path or os.curdir, filename)).st_mtime_ns
+                    except OSError:
+                        continue
+                    checksum.update('{}:{}\0'.format(filename, mtime).encode('utf-8', 'surrogateescape'))
+        return checksum.hexdigest()
+
+    def scan(self) -> Dict[Text, Dict[Text, EntryPoint]]:
+        """read the entry points of all installed distributions
+
+        If an entry point name is registered more than once, the first one found on sys.path is used.
+        """
+        index: Dict[Text, Dict[Text, EntryPoint]] = {}
+        for entry_point in self.backend.iter_entry_points():
+            index.setdefault(entry_point.group, {}).setdefault(entry_point.name, entry_point)
+        return index
+
+    def _load(self) -> Dict[Text, Dict[Text, EntryPoint]]:
+        key = '{}:{}'.format(self.backend.NAME, self.cache_key())
+        cached = read_cache(self.CACHEFILE, key)
+        if isinstance(cached, dict):
+            logging.debug("using cached entry points")
+            return {
+                group: {name: EntryPoint(name, group, value) for name, value in entry_points.items()}
+                for group, entry_points in cached.items()
+            }
+        index = self.scan()
+        write_cache(self.CACHEFILE, key, {
+            group: {name: entry_point.value for name, entry_point in entry_points.items()}
+            for group, entry_points in index.items()
+        })
+        return index
+
+
+entry_point_index = EntryPointIndex()
+
+
+def set_discovery_backend(backend: Union[Text, EntryPointBackend]) -> None:
+    """change the backend of the entry point index
+
+    The backend can be passed as name ("importlib" or "pkg_resources") or as instance.
+    """
+    if isinstance(backend, str):
+        if backend not in DISCOVERY_BACKENDS:
+            raise ValueError('unknown discovery backend {}'.format(backend))
+        backend = DISCOVERY_BACKENDS[backend]()
+    entry_point_index.backend = backend
+
+
+def _find_module_source(module_name: Text) -> Optional[Text]:
+    """returns the path to the source file of a module without importing the module or its parent packages
+    """
+    search_path: Optional[List[Text]] = None
+    parts = module_name.split('.')
+    spec = None
+    for index in range(len(parts)):
+        if index and search_path is None:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec('.'.join(parts[:index + 1]), search_path)
+        if spec is None:
+            return None
+        search_path = list(spec.submodule_search_locations) if spec.submodule_search_locations else None
+    if spec is None or not spec.has_location or not spec.origin or not spec.origin.endswith('.py'):
+        return None
+    return cast(Text, spec.origin)
+
+
+def _read_docstring(module_name: Text, attr: Text) -> Optional[Text]:
+    """read the docstring of a class from the source file of the module without executing it
+    """
+    source_file = _find_module_source(module_name)
+    if not source_file:
+        return None
+    import ast  # pylint: disable=import-outside-toplevel
+    try:
+        with open(source_file, 'rb') as source:
+            node: ast.AST = ast.parse(source.read(), source_file)
+    except (OSError, SyntaxError, ValueError):
+        logging.debug("unable to parse %s", source_file)
+        return None
+    for name in filter(None, attr.split('.')):
+        for child in getattr(node, 'body', []):
+            if isinstance(child, ast.ClassDef) and child.name == name:
+                node = child
+                break
+        else:
+            return None
+    if not isinstance(node, ast.ClassDef):
+        return None
+    return ast.get_docstring(node, clean=False)
+
+
+@functools.lru_cache(maxsize=None)
+def get_entry_point_description(entry_point: EntryPoint) -> Text:
+    """returns the first line of the docstring of an entry point
+
+    Entry points, which are not imported yet, are not loaded. The docstring is read from the source file instead.
+    """
+    module = sys.modules.get(entry_point.module_name)
+    docstring: Optional[Text]
+    if module is not None:
+        obj: Any = module
+        for attrname in filter(None, entry_point.attr.split('.')):
+            obj = getattr(obj, attrname, None)
+        docstring = getattr(obj, '__doc__', None) if obj is not None and obj is not module else None
+    else:
+        docstring = _read_docstring(entry_point.module_name, entry_point.attr)
+    return docstring.split("\n")[0] if docstring else ""
+
+
 @typechecked
 def load_entry_point(entrypoint: str, name: str) -> Optional[Type['BaseModule']]:
-    for entry_point in pkg_resources.iter_entry_points(entrypoint):
-        if entry_point.name == name or entry_point.module_name == name:
-            return cast(Type['BaseModule'], entry_point.load())
-    return None
+    entry_point = entry_point_index.get(entrypoint, name)
+    if entry_point is None:
+        return None
+    return cast(Type['BaseModule'], entry_point.load())
+
+
+class _ModuleHelpMixin():
+    """Action mixin, which appends the available modules to the help text
+
+    The help text is created when it is rendered, so module descriptions are only read if the help is requested.
+    """
+    entry_point_groups: Tuple[Text, ...] = ()
+    _help: Optional[Text] = None
+
+    @property
+    def help(self) -> Optional[Text]:
+        if self._help == argparse.SUPPRESS:
+            return self._help
+        entrypoints: Dict[Text, Text] = {}
+        for entry_point_group in self.entry_point_groups:
+            entrypoints.update(get_entrypoint_modules(entry_point_group))
+        if not entrypoints:
+            return self._help
+        return "{}\navailable modules:\n{}".format(self._help or "", "\n".join(entrypoints.values()))
+
+    @help.setter
+    def help(self, value: Optional[Text]) -> None:
+        self._help = value
 
 
 @typechecked
 def load_module(moduleloader: Optional['ModuleParser'] = None, entry_point_name: Optional[str] = None) -> Type['argparse.Action']:
     """Action, um BaseModule mit der Methode "add_module" des ModuleParsers als Kommandozeilenparameter definieren zu können
     """
-    class ModuleLoaderAction(argparse.Action):
+    class ModuleLoaderAction(_ModuleHelpMixin, argparse.Action):
+        entry_point_groups = (entry_point_name, ) if entry_point_name else ()
+
         def __call__(self, parser: argparse.ArgumentParser, namespace: argparse.Namespace, values: Union[Text, Sequence[Any], None], option_string: Optional[Text] = None) -> None:
             if values:
                 if entry_point_name:
-                    entry_point_list = []
-                    for entry_point in pkg_resources.iter_entry_points(entry_point_name):
-                        entry_point_list.append(entry_point.name)
-                        if entry_point.name == values or entry_point.module_name == values:
-                            values = [entry_point.load()]
-                            break
+                    entry_point = entry_point_index.get(entry_point_name, values) if isinstance(values, str) else None
+                    if entry_point is not None:
+                        if moduleloader is not None and moduleloader.prefetcher is not None:
+                            moduleloader.prefetcher.wait(entry_point.module_name)
+                        values = [_timed_load(entry_point.load)]
                     else:
                         try:
-                            values = get_module_class(values, moduleloader)
+                            values = _timed_load(lambda: get_module_class(values, moduleloader))
                         except Exception:
                             raise argparse.ArgumentError(
                                 self,
                                 "BaseModule '{}' not found! Valid modules are: {}".format(
                                     values,
-                                    ", ".join(entry_point_list)
+                                    ", ".join(entry_point_index.group(entry_point_name))
                                 )
                             )
                 else:
-                    values = get_module_class(values, moduleloader)
+                    values = _timed_load(lambda: get_module_class(values, moduleloader))
                 setattr(namespace, self.dest, values[0] if values else None)
     return ModuleLoaderAction
 
 
+def _timed_load(load: Callable[[], Any]) -> Any:
+    """load a module class or a list of module classes and record the import time in the current StartupProfiler"""
+    start = time.perf_counter()
+    loaded = load()
+    profiler = StartupProfiler.current()
+    modulecls = loaded[0] if isinstance(loaded, list) and loaded else loaded
+    if profiler is not None and modulecls:
+        profiler.add(modulecls, 'import', time.perf_counter() - start)
+    return loaded
+
+
 @typechecked
 def append_modules(moduleloader: Optional['ModuleParser'] = None, baseclasses: Optional[Tuple[Type['BaseModule'], ...]] = None, use_entrypoints: bool = False) -> Type['argparse._AppendAction']:
     """Action für den ModuleParser um BaseModule als Kommanozeilen Parameter "--module" definieren zu können
     """
-    class ModuleLoaderAppendAction(argparse._AppendAction):
+    class ModuleLoaderAppendAction(_ModuleHelpMixin, argparse._AppendAction):
+        entry_point_groups = tuple(basecls.__name__ for basecls in baseclasses or ()) if use_entrypoints else ()
+
+        @staticmethod
+        def _load_entry_point(basecls: Type['BaseModule'], name: Text) -> Optional[Type['BaseModule']]:
+            entry_point = entry_point_index.get(basecls.__name__, name)
+            if entry_point is not None and moduleloader is not None and moduleloader.prefetcher is not None:
+                moduleloader.prefetcher.wait(entry_point.module_name)
+            return load_entry_point(basecls.__name__, name)
+
         def __call__(self, parser: argparse.ArgumentParser, namespace: argparse.Namespace, values: Union[Text, Sequence[Any], None], option_string: Optional[Text] = None) -> None:
             if not values:
                 return
             if not use_entrypoints:
-                for module in get_module_class(
+                for module in _timed_load(lambda: get_module_class(
                     values, moduleloader,
                     modules_from_file=parser.modules_from_file if isinstance(parser, ModuleParser) else False
-                ):
+                )):
                     super().__call__(parser, namespace, module, option_string)  # type: ignore
                 return
 
             for basecls in baseclasses or []:
-                for entrypoint_module in values:
-                    modulecls = load_entry_point(basecls.__name__, entrypoint_module)
+                for entrypoint_module in [values] if isinstance(values, str) else values:
+                    modulecls = _timed_load(lambda: self._load_entry_point(basecls, entrypoint_module))
                     if modulecls:
                         super().__call__(parser, namespace, modulecls, option_string)  # type: ignore
 
@@ -215,9 +715,8 @@ def append_modules(moduleloader: Optional['ModuleParser'] = None, baseclasses: O
 @typechecked
 def get_entrypoint_modules(entry_point_name: Text) -> Dict[Text, Text]:
     entrypoints = {}
-    for entry_point in pkg_resources.iter_entry_points(entry_point_name):
-        entry_point_cls = entry_point.load()
-        entry_point_desc = "" if entry_point_cls.__doc__ is None else entry_point_cls.__doc__.split("\n")[0]
+    for entry_point in entry_point_index.group(entry_point_name).values():
+        entry_point_desc = get_entry_point_description(entry_point)
         if entry_point_desc:
             entry_point_description = "\t* {} -> {}".format(entry_point.name, entry_point_desc)
         else:
@@ -228,11 +727,13 @@ def get_entrypoint_modules(entry_point_name: Text) -> Dict[Text, Text]:
 
 @typechecked
 def set_module_kwargs(entry_point_name: Text, **kwargs: Any) -> Dict[Text, Any]:
-    entrypoints = get_entrypoint_modules(entry_point_name)
+    """set the entry point names as choices
+
+    The list of available modules is appended to the help text by the action, when the help is rendered.
+    """
+    entrypoints = entry_point_index.group(entry_point_name)
     if entrypoints:
         kwargs['choices'] = entrypoints.keys()
-        kwargs['help'] = kwargs.get('help') or ""
-        kwargs['help'] += "\navailable modules:\n{}".format("\n".join(entrypoints.values()))
     return kwargs
 
 
@@ -270,30 +771,105 @@ class _ModuleArgumentParser(argparse.ArgumentParser):
         super().error(message)
 
 
+class ModuleTemplate():
+    """Parsed arguments of a module class, which are used to create new instances without parsing
+
+    The parsed values and the actions of the parser are stored as immutable mappings.
+    :meth:`namespace` returns a new namespace for each instance, containers are copied,
+    so an instance can not change the values of other instances.
+
+    Only values, which are immutable or containers of immutable values, can be copied. If a value is another
+    object (e.g. a file opened by argparse.FileType), the template is not reusable and each instance
+    must parse its own arguments.
+    """
+
+    _IMMUTABLE_TYPES: Tuple[type, ...] = (type(None), bool, int, float, complex, str, bytes, type)
+    _CONTAINER_TYPES: Tuple[type, ...] = (list, tuple, dict, set, frozenset)
+
+    def __init__(self, values: argparse.Namespace, actions: Sequence[argparse.Action]) -> None:
+        self.reusable: bool = all(self.copyable(value) for value in vars(values).values())
+        self.values: Mapping[Text, Any] = types.MappingProxyType(dict(vars(values)) if self.reusable else {})
+        self.actions: Mapping[Text, argparse.Action] = types.MappingProxyType({action.dest: action for action in actions})
+
+    @classmethod
+    def copyable(cls, value: Any) -> bool:
+        """returns True, if the value is immutable or a container, which only contains copyable values"""
+        if isinstance(value, cls._IMMUTABLE_TYPES):
+            return True
+        if isinstance(value, dict):
+            return all(cls.copyable(key) and cls.copyable(item) for key, item in value.items())
+        if isinstance(value, cls._CONTAINER_TYPES):
+            return all(cls.copyable(item) for item in value)
+        return False
+
+    def namespace(self, **kwargs: Any) -> argparse.Namespace:
+        """create a namespace from the template values, which are updated with the validated kwargs"""
+        if not self.reusable:
+            raise ValueError('template values can not be copied')
+        values = {
+            name: copy.deepcopy(value) if isinstance(value, self._CONTAINER_TYPES) else value
+            for name, value in self.values.items()
+        }
+        values.update(self.check_kwargs(kwargs))
+        return argparse.Namespace(**values)
+
+    def check_kwargs(self, kwargs: Dict[Text, Any]) -> Dict[Text, Any]:
+        for param_name, param_value in kwargs.items():
+            action = self.actions.get(param_name)
+            if not action:
+                raise KeyError('keyword argument {} has no param'.format(param_name))
+            # check if it is an instance of the argument type, converter functions can not be checked
+            if inspect.isclass(action.type) and not isinstance(param_value, action.type):  # type: ignore
+                raise ValueError('Value {} for parameter is not an instance of {}'.format(param_value, action.type))
+        return kwargs
+
+
 class BaseModule():
     _parser: Optional[_ModuleArgumentParser] = None
     _parser_group: Optional[argparse._ArgumentGroup] = None
     _modules: Optional[List[Tuple[argparse.Action, Any]]] = None
+    _templates: Optional[Dict[Tuple[Tuple[Text, ...], int], ModuleTemplate]] = None
     CONFIG_PREFIX: Optional[Text] = None
+    MAX_TEMPLATES: int = 128
 
     @typechecked
     def __init__(self, args: Optional[Sequence[Text]] = None, namespace: Optional[argparse.Namespace] = None, **kwargs: Any) -> None:
         self.args: argparse.Namespace
+        if namespace is None:
+            template = self.template(args)
+            if template.reusable:
+                self.args = template.namespace(**kwargs)
+                return
+
         parser_retval = self.parser().parse_known_args(args, namespace)
         if parser_retval is None:
             raise InvalidModuleArguments()
         self.args, _ = parser_retval
-
-        actions = {action.dest: action for action in self.parser()._actions}
-        for param_name, param_value in kwargs.items():
-            action = actions.get(param_name)
-            if not action:
-                raise KeyError('keyword argument {} has no param'.format(param_name))
-            # check if it is an instance of the argument type, ignore mypy error because of false positive
-            if hasattr(action, 'type') and not isinstance(param_value, action.type):  # type: ignore
-                raise ValueError('Value {} for parameter is not an instance of {}'.format(param_value, action.type))
+        for param_name, param_value in ModuleTemplate(self.args, self.parser()._actions).check_kwargs(kwargs).items():
             setattr(self.args, param_name, param_value)
 
+    @classmethod
+    def template(cls, args: Optional[Sequence[Text]] = None) -> ModuleTemplate:
+        """returns the parsed arguments of this class for the given argv
+
+        The arguments are parsed once per argv. The template is parsed again, when arguments were
+        added to the parser after the template was created.
+        """
+        if '_templates' not in cls.__dict__ or cls._templates is None:
+            cls._templates = {}
+        parser = cls.parser()
+        key = (tuple(sys.argv[1:] if args is None else args), len(parser._actions))
+        template = cls._templates.get(key)
+        if template is None:
+            parser_retval = parser.parse_known_args(args)
+            if parser_retval is None:
+                raise InvalidModuleArguments()
+            template = ModuleTemplate(parser_retval[0], parser._actions)
+            if len(cls._templates) >= cls.MAX_TEMPLATES:
+                cls._templates.clear()
+            cls._templates[key] = template
+        return template
+
     @classmethod
     @typechecked
     def add_module(cls, *args: Any, **kwargs: Any) -> None:
@@ -351,6 +927,452 @@ class ModuleParserPlugin(BaseModule):
     pass
 
 
+PROFILE_ENV: Text = 'ENHANCEMENTS_PROFILE'
+
+
+_profilers = threading.local()
+
+
+class StartupProfiler():
+    """Records the time of the startup phases of a ModuleParser and of each module
+
+    The report is written when the parser is created, if the profiler has an output:
+
+        - stderr (or 1) -- human readable report to stderr
+        - json -- json report to stderr
+        - any other value is the path of a json report file
+
+    The output is set with the argument "profile" of the ModuleParser or with ``ENHANCEMENTS_PROFILE``.
+    """
+
+    def __init__(self, output: Optional[Text] = None) -> None:
+        self.output: Optional[Text] = output
+        self.phases: List[Tuple[Text, float]] = []
+        self.modules: Dict[Text, Dict[Text, float]] = {}
+
+    def reset(self) -> None:
+        self.phases = []
+        self.modules = {}
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[None]:
+        """make this profiler the current profiler of the thread, which records the imports of module actions"""
+        previous = self.current()
+        _profilers.current = self
+        try:
+            yield
+        finally:
+            _profilers.current = previous
+
+    @staticmethod
+    def current() -> Optional['StartupProfiler']:
+        return getattr(_profilers, 'current', None)
+
+    @contextlib.contextmanager
+    def phase(self, name: Text) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    @contextlib.contextmanager
+    def module(self, module: Any, phase: Text) -> Iterator[None]:
+        """time a phase of a module, the time of repeated phases is added"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(module, phase, time.perf_counter() - start)
+
+    def add(self, module: Any, phase: Text, seconds: float) -> None:
+        timings = self.modules.setdefault(self.module_name(module), {})
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+    @staticmethod
+    def module_name(module: Any) -> Text:
+        if isinstance(module, str):
+            return module
+        return _class_path(module) or getattr(module, '__name__', repr(module))
+
+    def report(self) -> Dict[Text, Any]:
+        return {
+            'total': sum(seconds for _, seconds in self.phases),
+            'phases': [{'name': name, 'seconds': seconds} for name, seconds in self.phases],
+            'modules': self.modules
+        }
+
+    def format(self) -> Text:
+        report = self.report()
+        lines = ['startup profile: {:.2f} ms'.format(report['total'] * 1000)]
+        lines.extend('  {:<20} {:>10.2f} ms'.format(name, seconds * 1000) for name, seconds in self.phases)
+        if self.modules:
+            lines.append('modules:')
+            for name, timings in sorted(self.modules.items(), key=lambda item: -sum(item[1].values())):
+                lines.append('  {:<50} {}'.format(name, '  '.join(
+                    '{} {:.2f} ms'.format(phase, seconds * 1000) for phase, seconds in timings.items()
+                )))
+        return '\n'.join(lines)
+
+    def emit(self) -> None:
+        if not self.output or self.output == '0':
+            return
+        if self.output in ('1', 'stderr'):
+            sys.stderr.write(self.format() + '\n')
+        elif self.output == 'json':
+            sys.stderr.write(json.dumps(self.report()) + '\n')
+        else:
+            with open(self.output, 'w', encoding='utf-8') as report_file:
+                json.dump(self.report(), report_file, indent=4)
+
+
+class ModuleResolver():
+    """Resolves the module tree of a ModuleParser in a single pass
+
+    The parser of each module is parsed exactly once. Submodules, which are selected by the parsed arguments,
+    are added to the dependency graph while it is traversed. :meth:`resolve` returns the modules in
+    topological order, each module is returned before its submodules.
+    Cyclic module dependencies are reported with a ModuleError.
+    """
+
+    _VISITING: int = 1
+    _DONE: int = 2
+
+    def __init__(
+        self,
+        moduleloader: Optional['ModuleParser'] = None,
+        args: Optional[Sequence[Text]] = None,
+        namespace: Optional[argparse.Namespace] = None
+    ) -> None:
+        self.moduleloader: Optional['ModuleParser'] = moduleloader
+        self.args: Optional[Sequence[Text]] = args
+        self.namespace: Optional[argparse.Namespace] = namespace
+        self.parsed_args: Dict[Type[BaseModule], Optional[argparse.Namespace]] = {}
+        self._roots: List[Tuple[Any, Tuple[Type[BaseModule], ...]]] = []
+        self._state: Dict[Type[BaseModule], int] = {}
+        self.profiler: StartupProfiler = getattr(moduleloader, 'profiler', None) or StartupProfiler()
+
+    def add(self, module: Any, baseclasses: Union[Type[BaseModule], Tuple[Type[BaseModule], ...]]) -> None:
+        """add a module class, an entry point name or a module path to the graph"""
+        if not isinstance(baseclasses, tuple):
+            baseclasses = (baseclasses, )
+        for module_item in module if isinstance(module, (list, tuple)) else [module]:
+            if module_item is not None:
+                self._roots.append((module_item, baseclasses))
+
+    def add_actions(self, parsed_args: argparse.Namespace, actions: Sequence[Tuple[argparse.Action, Any]]) -> None:
+        """add the modules, which were selected with actions created by "add_module" """
+        for action, baseclass in actions:
+            self.add(getattr(parsed_args, action.dest, None), baseclass)
+
+    def parse(self, module: Type[BaseModule]) -> Optional[argparse.Namespace]:
+        """parse the arguments of a module, the result is cached for each module"""
+        if module not in self.parsed_args:
+            parsed_known_args = None
+            try:
+                with self.profiler.module(module, 'parser_arguments'):
+                    parser = module.parser()
+                with self.profiler.module(module, 'parse'):
+                    parsed_known_args = parser.parse_known_args(args=self.args, namespace=self.namespace)
+            except TypeError:
+                logging.exception("Unable to load modules")
+            self.parsed_args[module] = parsed_known_args[0] if parsed_known_args else None
+        return self.parsed_args[module]
+
+    def resolve(self) -> List[Type[BaseModule]]:
+        postorder: List[Type[BaseModule]] = []
+        # roots and submodules are visited in reverse order, so the reversed postorder keeps the order of the arguments
+        for module, baseclasses in reversed(self._roots):
+            self._visit(module, baseclasses, [], postorder)
+        return postorder[::-1]
+
+    def _load(self, module: Any, baseclasses: Tuple[Type[BaseModule], ...]) -> Type[BaseModule]:
+        if not isinstance(module, str):
+            return cast(Type[BaseModule], module)
+        for baseclass in baseclasses:
+            modulecls = load_entry_point(baseclass.__name__, module)
+            if modulecls is not None:
+                return modulecls
+        return get_module_class(module, self.moduleloader)[0]
+
+    def _visit(
+        self,
+        module: Any,
+        baseclasses: Tuple[Type[BaseModule], ...],
+        path: List[Type[BaseModule]],
+        postorder: List[Type[BaseModule]]
+    ) -> None:
+        start = time.perf_counter()
+        modulecls = self._load(module, baseclasses)
+        # the time is recorded for the class, because the module can be a name or a path
+        self.profiler.add(modulecls, 'import', time.perf_counter() - start)
+        if not inspect.isclass(modulecls) or not issubclass(modulecls, baseclasses):
+            logging.error('module %s is not a subclass of %s', modulecls, baseclasses)
+            raise ModuleError(baseclass=baseclasses)
+        state = self._state.get(modulecls)
+        if state == self._DONE:
+            return
+        if state == self._VISITING:
+            cycle = path[path.index(modulecls):] + [modulecls]
+            raise ModuleError(
+                modulecls,
+                baseclasses,
+                message="cyclic module dependency: {}".format(" -> ".join(m.__name__ for m in cycle))
+            )
+        self._state[modulecls] = self._VISITING
+        path.append(modulecls)
+        parsed_args = self.parse(modulecls)
+        if parsed_args is not None:
+            for action, baseclass in reversed(modulecls.modules()):
+                submodule = getattr(parsed_args, action.dest, None)
+                for submodule_item in reversed(submodule) if isinstance(submodule, (list, tuple)) else [submodule]:
+                    if submodule_item is not None:
+                        submodule_baseclass = baseclass if isinstance(baseclass, tuple) else (baseclass, )
+                        self._visit(submodule_item, submodule_baseclass, path, postorder)
+        path.pop()
+        self._state[modulecls] = self._DONE
+        postorder.append(modulecls)
+
+
+PARSER_SNAPSHOT_ENV: Text = 'ENHANCEMENTS_PARSER_SNAPSHOT'
+
+
+def _class_path(cls: Any) -> Optional[Text]:
+    """returns the import path of a class or None, if the class can not be imported by its path"""
+    if isinstance(cls, str) or cls is None:
+        return cls
+    qualname = getattr(cls, '__qualname__', '')
+    if '<locals>' in qualname or cls.__module__ not in sys.modules or cls.__module__.startswith('enhanced_moduleloader_'):
+        return None
+    return '{}:{}'.format(cls.__module__, qualname)
+
+
+def _import_class(path: Text) -> Any:
+    modname, qualname = path.split(':', 1)
+    obj: Any = importlib.import_module(modname)
+    for attrname in qualname.split('.'):
+        obj = getattr(obj, attrname)
+    return obj
+
+
+def _module_stamp(cls: Type[BaseModule]) -> Text:
+    """version of a module, which changes when the source file of the module was changed"""
+    module = sys.modules.get(cls.__module__)
+    stamp = [str(getattr(module, '__version__', ''))]
+    filename = getattr(module, '__file__', None)
+    if filename:
+        try:
+            stat = os.stat(filename)
+            stamp.extend((str(stat.st_mtime_ns), str(stat.st_size)))
+        except OSError:
+            pass
+    return ':'.join(stamp)
+
+
+class ParserSnapshot():
+    """Snapshot of the resolved module layout of a ModuleParser
+
+    The snapshot stores the modules of the merged parser in topological order. It is keyed by the selected modules,
+    the option names in argv and the version of enhancements. When a snapshot is loaded, the stored module versions and
+    the values of all options, which select submodules, must match, otherwise the module tree is resolved again.
+    """
+
+    CACHEDIR: Text = 'snapshots'
+
+    def __init__(
+        self,
+        moduleparser: 'ModuleParser',
+        args: Optional[Sequence[Text]],
+        selected_modules: Sequence[Any]
+    ) -> None:
+        self.argv: List[Text] = list(sys.argv[1:] if args is None else args)
+        self.key: Text = json.dumps([
+            enhancements_version,
+            moduleparser.prog,
+            [_class_path(baseclass) for baseclass in moduleparser.baseclasses],
+            [_class_path(module) for module in selected_modules],
+            [token.split('=', 1)[0] for token in self.argv if token.startswith('-') and token != '-']
+        ])
+        self.moduleparser: 'ModuleParser' = moduleparser
+        self.name: Text = '{}/{}.json'.format(self.CACHEDIR, hashlib.sha256(self.key.encode('utf-8')).hexdigest())
+
+    def option_values(self, option: Text) -> List[Text]:
+        return _get_option_values(self.argv, option)
+
+    def abbreviates(self, options: Iterable[Text]) -> bool:
+        """returns True, if an option in argv is an abbreviation of one of the options
+
+        argparse accepts abbreviated options, so the values of an abbreviated option can not be compared.
+        """
+        tokens = {token.split('=', 1)[0] for token in self.argv if token.startswith('-') and token != '-'}
+        return any(option != token and option.startswith(token) for option in options for token in tokens)
+
+    def load(self) -> Optional[List[Type[BaseModule]]]:
+        snapshot = read_cache(self.name, self.key)
+        if not isinstance(snapshot, dict) or self.abbreviates(snapshot['module_options']):
+            return None
+        for option, values in snapshot['module_options'].items():
+            if self.option_values(option) != values:
+                return None
+        modules: List[Type[BaseModule]] = []
+        for path, stamp in snapshot['modules']:
+            try:
+                module = _import_class(path)
+            except (ImportError, AttributeError):
+                return None
+            if _module_stamp(module) != stamp:
+                return None
+            modules.append(module)
+        logging.debug("using parser snapshot %s", self.name)
+        return modules
+
+    def store(self, modules: Sequence[Type[BaseModule]]) -> bool:
+        paths = [_class_path(module) for module in modules]
+        if None in paths:
+            logging.debug("parser snapshot not possible, because not all modules can be imported by path")
+            return False
+        module_actions = [action for action, _ in self.moduleparser._extra_modules]
+        for module in modules:
+            module_actions.extend(action for action, _ in module.modules())
+        module_options = {option for action in module_actions for option in action.option_strings}
+        if self.abbreviates(module_options):
+            logging.debug("parser snapshot not possible, because a module option is abbreviated")
+            return False
+        return write_cache(self.name, self.key, {
+            'modules': [[path, _module_stamp(module)] for path, module in zip(paths, modules)],
+            'module_options': {option: self.option_values(option) for option in sorted(module_options)}
+        })
+
+
+class CompletionIndex():
+    """Index of the options of a merged parser, which is used for bash completion
+
+    The index is stored after the parser was created. It is keyed by the modules, which were selected
+    with ``-m`` or ``--module``, because the options of the merged parser depend on these modules.
+    When argcomplete requests completions, the modules are read from the command line and options and their choices
+    are completed from the matching index, without importing any module.
+    Requests, which can not be answered from the index (e.g. file names, other module options or no index
+    for the selected modules), fall back to argcomplete.
+    """
+
+    CACHEDIR: Text = 'completion'
+    MODULE_OPTIONS: Tuple[Text, ...] = ('-m', '--module')
+
+    def __init__(self, moduleparser: 'ModuleParser') -> None:
+        self.moduleparser: 'ModuleParser' = moduleparser
+
+    def cache(self, modules: Sequence[Text]) -> Tuple[Text, Text]:
+        """returns the name and the key of the index for the selected modules"""
+        key = json.dumps([
+            enhancements_version,
+            self.moduleparser.prog,
+            [_class_path(baseclass) for baseclass in self.moduleparser.baseclasses],
+            list(modules)
+        ])
+        return '{}/{}.json'.format(self.CACHEDIR, hashlib.sha256(key.encode('utf-8')).hexdigest()), key
+
+    @classmethod
+    def selected_modules(cls, words: Sequence[Text], module_options: Iterable[Text]) -> Optional[List[Text]]:
+        """returns the values of -m and --module or None, if other module options are used or module options are abbreviated"""
+        module_options = set(module_options) | set(cls.MODULE_OPTIONS)
+        modules: List[Text] = []
+        for index, word in enumerate(words):
+            if word == '--':
+                break
+            if not word.startswith('-') or word == '-':
+                continue
+            option, has_value, value = word.partition('=')
+            if option in cls.MODULE_OPTIONS:
+                if has_value:
+                    modules.append(value)
+                elif index + 1 < len(words):
+                    modules.append(words[index + 1])
+            elif any(module_option.startswith(option) for module_option in module_options) or \
+                    (option.startswith('-m') and not option.startswith('--')):
+                return None
+        return modules
+
+    @staticmethod
+    def get_options(parser: argparse.ArgumentParser) -> Dict[Text, Dict[Text, Any]]:
+        options: Dict[Text, Dict[Text, Any]] = {}
+        for action in parser._actions:
+            if action.help == argparse.SUPPRESS:
+                continue
+            for option in action.option_strings:
+                options[option] = {
+                    'nargs': 0 if action.nargs == 0 else 1,
+                    'choices': [str(choice) for choice in action.choices] if action.choices else None
+                }
+        return options
+
+    def store(self, parser: argparse.ArgumentParser, args: Optional[Sequence[Text]] = None) -> None:
+        module_options = [
+            option for action in parser._actions if isinstance(action, _ModuleHelpMixin) for option in action.option_strings
+        ]
+        modules = self.selected_modules(list(sys.argv[1:] if args is None else args), module_options)
+        if modules is None:
+            return
+        name, key = self.cache(modules)
+        index = {'options': self.get_options(parser), 'module_options': sorted(module_options)}
+        if read_cache(name, key) != index:
+            write_cache(name, key, index)
+
+    def complete(self, comp_line: Text, comp_point: int, start: int = 1) -> Optional[List[Text]]:
+        """returns the completions or None, if the completion is not possible from the index"""
+        line = comp_line[:comp_point]
+        import shlex  # pylint: disable=import-outside-toplevel
+        try:
+            words = shlex.split(line)
+        except ValueError:
+            return None
+        prefix = words.pop() if words and not line[-1].isspace() else ''
+        words = words[start:]
+        modules = self.selected_modules(words, ())
+        if modules is None:
+            return None
+        index = read_cache(*self.cache(modules))
+        if not isinstance(index, dict) or self.selected_modules(words, index['module_options']) is None:
+            return None
+        options = index['options']
+        completions = None
+        previous = options.get(words[-1]) if words else None
+        if previous and previous['nargs']:
+            if previous['choices'] is not None:
+                completions = [choice for choice in previous['choices'] if choice.startswith(prefix)]
+        elif prefix.startswith(tuple(self.moduleparser.prefix_chars)) and '=' not in prefix:
+            completions = sorted(option for option in options if option.startswith(prefix))
+        # argcomplete decides, what to do, if nothing matches
+        return completions or None
+
+    def autocomplete(self) -> None:
+        """answer a completion request of argcomplete from the index and exit
+
+        The method returns, if argcomplete is not active or the index can not answer the request.
+        """
+        if '_ARGCOMPLETE' not in os.environ or os.environ.get('_ARGCOMPLETE_SHELL', 'bash') != 'bash':
+            return
+        if os.environ.get('_ARGCOMPLETE_DFS'):
+            return
+        try:
+            completions = self.complete(
+                os.environ['COMP_LINE'],
+                int(os.environ['COMP_POINT']),
+                int(os.environ['_ARGCOMPLETE'])
+            )
+        except (KeyError, ValueError):
+            return
+        if completions is None:
+            return
+        filename = os.environ.get('_ARGCOMPLETE_STDOUT_FILENAME')
+        try:
+            output_stream = open(filename, 'w') if filename else os.fdopen(8, 'w')
+        except OSError:
+            return
+        with output_stream:
+            output_stream.write(os.environ.get('_ARGCOMPLETE_IFS', '\013').join(completions))
+        os._exit(0)  # pylint: disable=protected-access
+
+
 class ModuleParser(_ModuleArgumentParser):
 
     @typechecked
@@ -362,8 +1384,13 @@ class ModuleParser(_ModuleArgumentParser):
         modules_from_file: bool = False,
         version: Optional[Text] = None,
         autocomplete: bool = False,
+        snapshot: bool = False,
+        prefetch: bool = False,
+        profile: Optional[Text] = None,
         **kwargs: Any
     ) -> None:
+        self.profiler: StartupProfiler = StartupProfiler(profile or os.environ.get(PROFILE_ENV))
+        self._profiled: bool = False
         if baseclass is None:
             baseclass = ()
 
@@ -378,10 +1405,12 @@ class ModuleParser(_ModuleArgumentParser):
         self.modules_from_file: bool = modules_from_file
         self.__kwargs = kwargs
         self._extra_modules: List[Tuple[argparse.Action, type]] = []
-        self._module_parsers: Set[argparse.ArgumentParser] = {self}
+        self._module_parsers: List[argparse.ArgumentParser] = [self]
         self._plugins: Dict[Type[ModuleParserPlugin], Optional[BaseModule]] = {}
         self.version: Optional[Text] = version
         self.autocomplete: bool = autocomplete
+        self.snapshot: bool = snapshot or os.environ.get(PARSER_SNAPSHOT_ENV, '') not in ('', '0')
+        self.prefetcher: Optional[ModulePrefetcher] = ModulePrefetcher() if prefetch else None
 
         self.baseclasses: Tuple[Type[BaseModule], ...] = self._get_baseclasses(baseclass)
 
@@ -393,13 +1422,12 @@ class ModuleParser(_ModuleArgumentParser):
 
         if self.baseclasses:
             choices = None
-            help_text = "Modules to parse and modify data"
-            entrypoints = {}
-            for baseclasses_item in self.baseclasses:
-                entrypoints.update(get_entrypoint_modules(baseclasses_item.__name__))
+            entrypoints: List[Text] = []
+            with self.profiler.phase('entry_points'):
+                for baseclasses_item in self.baseclasses:
+                    entrypoints.extend(entry_point_index.group(baseclasses_item.__name__))
             if entrypoints:
-                choices = list(entrypoints.keys())
-                help_text += "\navailable modules:\n{}".format("\n".join(entrypoints.values()))
+                choices = entrypoints
             self.add_argument(
                 '-m',
                 '--module',
@@ -407,7 +1435,7 @@ class ModuleParser(_ModuleArgumentParser):
                 action=append_modules(self, self.baseclasses, bool(entrypoints)),
                 default=self.default_class,
                 choices=choices,  # type: ignore
-                help=help_text
+                help="Modules to parse and modify data"
             )
         if self.version:
             self.add_argument(
@@ -449,7 +1477,7 @@ class ModuleParser(_ModuleArgumentParser):
         # remove help action from parser
         parser._actions[:] = [x for x in parser._actions if not isinstance(x, argparse._HelpAction)]
         # append parser to list
-        self._module_parsers.add(parser)
+        self._module_parsers.append(parser)
 
     @typechecked
     def add_module(self, *args: Any, **kwargs: Any) -> None:
@@ -481,15 +1509,9 @@ class ModuleParser(_ModuleArgumentParser):
         namespace: Optional[argparse.Namespace],
         modules: List[Tuple[argparse.Action, Type[BaseModule]]],
     ) -> List[argparse.ArgumentParser]:
-        modulelist = [getattr(parsed_args, m[0].dest) for m in modules if hasattr(parsed_args, m[0].dest)]
-        modulebasecls: List[Tuple[Type[BaseModule], ...]] = [(m[1], ) for m in modules]
-        return self.get_sub_modules(
-            parsed_args=parsed_args,
-            args=args,
-            namespace=namespace,
-            modules=modulelist,
-            baseclasses=modulebasecls
-        )
+        resolver = ModuleResolver(self, args, namespace)
+        resolver.add_actions(parsed_args, modules)
+        return [module.parser() for module in resolver.resolve()]
 
     @typechecked
     def get_sub_modules(
@@ -501,103 +1523,142 @@ class ModuleParser(_ModuleArgumentParser):
         modules: Optional[List[Type[BaseModule]]],
         baseclasses: Optional[List[Tuple[Type[BaseModule], ...]]] = None,
     ) -> List[argparse.ArgumentParser]:
-        moduleparsers: List[argparse.ArgumentParser] = []
         if not modules:
-            return moduleparsers
-        modulelist = [m for m in modules]
-        modulebasecls = baseclasses or [self.baseclasses for _ in modules]
-
-        for module, baseclass in zip(modulelist, modulebasecls):
-            if isinstance(module, str):
-                modulecls = load_entry_point(baseclass.__name__, module)
-                if module is None:
-                    raise ModuleError(module, baseclass)
-                module = modulecls
-            if not issubclass(module, baseclass):
-                logging.error('module is not an instance of baseclass')
-                raise ModuleError(module, baseclass)
-            if module is baseclass:
-                logging.error('module must not be baseclass!')
-                raise ModuleError(module, baseclass)
-            moduleparsers.append(module.parser())
-
-            try:
-                parsed_known_args = module.parser().parse_known_args(args=args, namespace=namespace)
-                if parsed_known_args:
-                    parsed_subargs: argparse.Namespace
-                    parsed_subargs, _ = parsed_known_args
-                    moduleparsers.extend(self.get_sub_modules_args(
-                        parsed_args=parsed_subargs,
-                        args=args,
-                        namespace=namespace,
-                        modules=module.modules()
-                    ))
-            except TypeError:
-                logging.exception("Unable to load modules")
-        return moduleparsers
+            return []
+        resolver = ModuleResolver(self, args, namespace)
+        for module, baseclass in zip(modules, baseclasses or [self.baseclasses for _ in modules]):
+            resolver.add(module, baseclass)
+        return [module.parser() for module in resolver.resolve()]
 
     @typechecked
     def _check_value(self, action: Any, value: Any) -> None:
         pass
 
+    @typechecked
+    def _prefetch_modules(self, args: Optional[Sequence[Text]] = None) -> None:
+        """start the import of all modules, which are selected in the command line arguments"""
+        if self.prefetcher is None:
+            return
+        argv = list(sys.argv[1:] if args is None else args)
+        module_options: List[Tuple[Text, Tuple[Type[BaseModule], ...]]] = [
+            (option, self.baseclasses) for option in ('-m', '--module') if self.baseclasses
+        ]
+        for action, baseclass in self._extra_modules:
+            module_options.extend((option, (baseclass, )) for option in action.option_strings)
+        for option, baseclasses in module_options:
+            for value in _get_option_values(argv, option):
+                for baseclass in baseclasses:
+                    entry_point = entry_point_index.get(baseclass.__name__, value)
+                    if entry_point is not None:
+                        self.prefetcher.prefetch(entry_point.module_name)
+                        break
+                else:
+                    try:
+                        modname, _ = _split_module_string(value, self)
+                    except ValueError:
+                        continue
+                    if not os.path.isfile(modname):
+                        self.prefetcher.prefetch(modname)
+
     @typechecked
     def _create_parser(self, args: Optional[Sequence[Text]] = None, namespace: Optional[argparse.Namespace] = None) -> 'argparse.ArgumentParser':
-        parsed_args_tuple = super().parse_known_args(args=args, namespace=namespace)
-        if not parsed_args_tuple:
-            self.exit_on_error = False
-            super().parse_known_args(args=args, namespace=namespace)
+        # each report covers the creation of one parser, the first one also includes the phases of __init__
+        if self._profiled:
+            self.profiler.reset()
+        self._profiled = True
+        with self.profiler.activate():
+            parser = self._build_parser(args, namespace)
+        self.profiler.emit()
+        return parser
+
+    def _build_parser(
+        self, args: Optional[Sequence[Text]], namespace: Optional[argparse.Namespace]
+    ) -> 'argparse.ArgumentParser':
+        profiler = self.profiler
+        with profiler.phase('prefetch'):
+            self._prefetch_modules(args)
+        with profiler.phase('parse'):
+            parsed_args_tuple = super().parse_known_args(args=args, namespace=namespace)
+            if not parsed_args_tuple:
+                self.exit_on_error = False
+                super().parse_known_args(args=args, namespace=namespace)
 
         parsed_args, _ = parsed_args_tuple
 
-        # load modules from cmd args
-        if self.baseclasses:
-            for module in parsed_args.modules:
-                if not issubclass(module, self.baseclasses):
-                    raise ModuleError(module, self.baseclasses)
-                if module is self.baseclasses:
-                    raise ModuleError(module, self.baseclasses)
-                self.add_parser(module.parser())
-                parsed_sub_args_tuple = module.parser().parse_known_args(args=args, namespace=namespace)
-                if parsed_sub_args_tuple:
-                    parsed_sub_args, _ = parsed_sub_args_tuple
-                    submods = self.get_sub_modules(
-                        parsed_args=parsed_sub_args,
-                        args=args,
-                        namespace=namespace,
-                        modules=parsed_args.modules
-                    )
-                    for submod in submods:
-                        self.add_parser(submod)
-
-        # load modules from add_module method
-        moduleparsers = self.get_sub_modules_args(
-            parsed_args=parsed_args,
-            args=args,
-            namespace=namespace,
-            modules=self._extra_modules
-        )
-        for moduleparser in moduleparsers:
-            self.add_parser(moduleparser)
+        for module in self._resolve_modules(args, namespace, parsed_args):
+            self.add_parser(module.parser())
+        if self.prefetcher is not None:
+            with profiler.phase('prefetch_join'):
+                self.prefetcher.join()
+
+        with profiler.phase('plugins'):
+            self._load_plugins(args)
+        # create complete argument parser and return arguments
+        with profiler.phase('merge'):
+            parser = argparse.ArgumentParser(parents=list(self._module_parsers), **self.__kwargs)
+        return parser
 
+    def _resolve_modules(
+        self, args: Optional[Sequence[Text]], namespace: Optional[argparse.Namespace], parsed_args: argparse.Namespace
+    ) -> List[Type['BaseModule']]:
+        """returns the selected modules from the parser snapshot or resolves them"""
+        profiler = self.profiler
+        # modules from cmd args and from add_module method
+        selected_modules = list(parsed_args.modules) if self.baseclasses else []
+        selected_modules.extend(getattr(parsed_args, action.dest, None) for action, _ in self._extra_modules)
+
+        snapshot = ParserSnapshot(self, args, selected_modules) if self.snapshot else None
+        if snapshot:
+            with profiler.phase('snapshot'):
+                modules = snapshot.load()
+            if modules is not None:
+                return modules
+        with profiler.phase('resolve'):
+            resolver = ModuleResolver(self, args, namespace)
+            if self.baseclasses:
+                resolver.add(parsed_args.modules, self.baseclasses)
+            resolver.add_actions(parsed_args, self._extra_modules)
+            modules = resolver.resolve()
+            if snapshot:
+                snapshot.store(modules)
+        return modules
+
+    def _load_plugins(self, args: Optional[Sequence[Text]]) -> None:
+        profiler = self.profiler
         # load plugins
         for plugin in self._plugins:
-            self.add_parser(plugin.parser())
+            with profiler.module(plugin, 'parser_arguments'):
+                self.add_parser(plugin.parser())
 
         # initialize plugins
         for plugin in self._plugins:
             try:
-                self._plugins[plugin] = plugin(args)
+                with profiler.module(plugin, 'init'):
+                    self._plugins[plugin] = plugin(args)
             except InvalidModuleArguments:
                 logging.debug("Error Plugin init")
-        # create complete argument parser and return arguments
-        parser = argparse.ArgumentParser(parents=list(self._module_parsers), **self.__kwargs)
-        return parser
+
+    @typechecked
+    def _autocomplete(self, parser: Optional[argparse.ArgumentParser] = None, args: Optional[Sequence[Text]] = None) -> None:
+        """bash completion with argcomplete
+
+        Without a parser, the completion is answered from the completion index before any module is loaded.
+        """
+        if not self.autocomplete:
+            return
+        completion_index = CompletionIndex(self)
+        if parser is None:
+            completion_index.autocomplete()
+            return
+        completion_index.store(parser, args)
+        import argcomplete  # pylint: disable=import-outside-toplevel
+        argcomplete.autocomplete(parser)
 
     @typechecked
     def parse_args(self, args: Optional[Sequence[Text]] = None, namespace: Optional[argparse.Namespace] = None) -> argparse.Namespace:  # type: ignore
+        self._autocomplete()
         parser = self._create_parser(args=args, namespace=namespace)
-        if self.autocomplete:
-            argcomplete.autocomplete(parser)
+        self._autocomplete(parser, args)
         args_namespace = parser.parse_args(args, namespace)
         if not args_namespace:
             return argparse.Namespace()
@@ -605,7 +1666,339 @@ class ModuleParser(_ModuleArgumentParser):
 
     @typechecked
     def parse_known_args(self, args: Optional[Sequence[Text]] = None, namespace: Optional[argparse.Namespace] = None) -> Tuple[argparse.Namespace, List[str]]:
+        self._autocomplete()
         parser = self._create_parser(args=args, namespace=namespace)
-        if self.autocomplete:
-            argcomplete.autocomplete(parser)
+        self._autocomplete(parser, args)
         return parser.parse_known_args(args, namespace)
+
+
+class StageStats():
+    """Throughput statistics of a pipeline stage"""
+
+    def __init__(self, name: Text) -> None:
+        self.name: Text = name
+        self.chunks: int = 0
+        self.bytes: int = 0
+        self.seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """processed bytes per second"""
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def __repr__(self) -> Text:
+        return '<StageStats {}: {} chunks, {} bytes, {:.3f} s, {:.0f} bytes/s>'.format(
+            self.name, self.chunks, self.bytes, self.seconds, self.throughput
+        )
+
+
+def _create_pipeline_modules(
+    modules: Sequence[Union[Type[BaseModule], BaseModule]], args: Optional[Sequence[Text]]
+) -> List[BaseModule]:
+    """instantiate the modules of a pipeline and check if each module has an execute method"""
+    instances: List[BaseModule] = [module(args) if inspect.isclass(module) else module for module in modules]  # type: ignore
+    for module in instances:
+        if not callable(getattr(module, 'execute', None)):
+            raise ModuleError(message='module {} has no execute method'.format(type(module).__name__))
+    return instances
+
+
+def _read_chunks(source: Any, chunk_size: int) -> Iterator[Any]:
+    """iterate over an iterable or read chunks from a file-like object"""
+    if not hasattr(source, 'read'):
+        yield from source
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+_worker_module: Optional[BaseModule] = None
+_worker_config: Optional[Tuple[Text, bytes]] = None
+
+
+def _init_module_worker(path: Text, args: Dict[Text, Any]) -> None:
+    """create the module instance of a worker process from the class path and the parsed arguments"""
+    global _worker_module  # pylint: disable=global-statement
+    modulecls = _import_class(path)
+    # argparse keeps values, which are already set in the namespace, so the parsed arguments are used
+    _worker_module = modulecls([], argparse.Namespace(**args))
+
+
+def _execute_in_worker(config: Tuple[Text, bytes], data: Any) -> Any:
+    # the module is created on the first task, because ProcessPoolExecutor has no initializer before Python 3.7
+    global _worker_config  # pylint: disable=global-statement
+    if _worker_config != config:
+        import pickle  # pylint: disable=import-outside-toplevel
+        _init_module_worker(config[0], pickle.loads(config[1]))
+        _worker_config = config
+    result = _worker_module.execute(data)  # type: ignore
+    return data if result is None else result
+
+
+class ProcessPoolModule():
+    """Runs the execute method of a module in a pool of worker processes
+
+    The class path and the pickled arguments of the module are sent with each chunk. A worker creates its
+    module instance, when it receives the first chunk, and reuses it for all following chunks.
+    Data chunks are sent to the workers and the results are returned in the order of the chunks.
+
+    A ProcessPoolModule can be used as a stage of a Pipeline, to run CPU bound modules on all cores.
+    The module class must be importable by its path and the parsed arguments must be picklable.
+    """
+
+    def __init__(self, module: BaseModule, processes: Optional[int] = None, max_pending: Optional[int] = None) -> None:
+        path = _class_path(type(module))
+        if path is None:
+            raise ModuleError(message='module {} can not be imported in a worker process'.format(type(module).__name__))
+        self.module: BaseModule = module
+        self.processes: int = processes or os.cpu_count() or 1
+        self.max_pending: int = max_pending or self.processes * 2
+        import concurrent.futures  # pylint: disable=import-outside-toplevel
+        import pickle  # pylint: disable=import-outside-toplevel
+        self._config: Tuple[Text, bytes] = (path, pickle.dumps(vars(module.args)))
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.processes)
+
+    def execute(self, data: Any) -> Any:
+        return self._executor.submit(_execute_in_worker, self._config, data).result()
+
+    def map(self, chunks: Iterable[Any]) -> Iterator[Any]:
+        """execute the module for all chunks in parallel and return the results in order
+
+        Only max_pending chunks are sent to the workers at the same time, to limit the memory usage.
+        """
+        pending: 'collections.deque[concurrent.futures.Future[Any]]' = collections.deque()
+        try:
+            for chunk in chunks:
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+                pending.append(self._executor.submit(_execute_in_worker, self._config, chunk))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'ProcessPoolModule':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        self.close()
+
+
+class _StageError():
+    """Wrapper to pass an exception from a pipeline stage thread to the consumer"""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error: BaseException = error
+
+
+def _put_chunk(buffer: 'queue.Queue[Any]', stopped: threading.Event, item: Any) -> bool:
+    """put an item in the queue of a pipeline stage, returns False if the consumer was stopped"""
+    import queue  # pylint: disable=import-outside-toplevel
+    while not stopped.is_set():
+        try:
+            buffer.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce_chunks(chunks: Iterator[Any], buffer: 'queue.Queue[Any]', stopped: threading.Event, end: Any) -> None:
+    """producer thread of a buffered pipeline stage, errors are passed to the consumer"""
+    try:
+        for chunk in chunks:
+            if not _put_chunk(buffer, stopped, chunk):
+                return
+        _put_chunk(buffer, stopped, end)
+    except BaseException as error:  # pylint: disable=broad-except
+        _put_chunk(buffer, stopped, _StageError(error))
+    finally:
+        getattr(chunks, 'close', lambda: None)()
+
+
+class Pipeline():
+    """Streams data chunks through the execute methods of a chain of modules
+
+    Each module is instantiated once. Chunks are read from an iterable or a file-like object and passed to the
+    modules in order. The return value of a module is passed to the next module. If a module returns None,
+    the chunk is passed on unchanged.
+
+    Without buffering, the stages are chained generators and only one chunk per stage is in flight.
+    With a buffer size, each stage runs in its own thread and the stages are connected by bounded queues.
+    A full queue blocks the previous stage, so the memory usage does not depend on the size of the input.
+    """
+
+    _END = object()
+
+    def __init__(
+        self,
+        modules: Sequence[Union[Type[BaseModule], BaseModule]],
+        args: Optional[Sequence[Text]] = None,
+        buffer_size: int = 0,
+        chunk_size: int = 65536
+    ) -> None:
+        self.modules: List[BaseModule] = _create_pipeline_modules(modules, args)
+        self.buffer_size: int = buffer_size
+        self.chunk_size: int = chunk_size
+        self.stats: List[StageStats] = [StageStats(type(module).__name__) for module in self.modules]
+
+    @staticmethod
+    def _stage(module: BaseModule, stats: StageStats, chunks: Iterable[Any]) -> Iterator[Any]:
+        if isinstance(module, ProcessPoolModule):
+            yield from Pipeline._process_pool_stage(module, stats, chunks)
+            return
+        execute = module.execute  # type: ignore
+        for chunk in chunks:
+            start = time.perf_counter()
+            result = execute(chunk)
+            stats.seconds += time.perf_counter() - start
+            stats.chunks += 1
+            stats.bytes += len(chunk) if hasattr(chunk, '__len__') else 0
+            yield chunk if result is None else result
+
+    @staticmethod
+    def _process_pool_stage(module: ProcessPoolModule, stats: StageStats, chunks: Iterable[Any]) -> Iterator[Any]:
+        def count(chunks: Iterable[Any]) -> Iterator[Any]:
+            for chunk in chunks:
+                stats.chunks += 1
+                stats.bytes += len(chunk) if hasattr(chunk, '__len__') else 0
+                yield chunk
+
+        results = module.map(count(chunks))
+        while True:
+            start = time.perf_counter()
+            try:
+                result = next(results)
+            except StopIteration:
+                return
+            finally:
+                stats.seconds += time.perf_counter() - start
+            yield result
+
+    def _buffered(self, chunks: Iterator[Any]) -> Iterator[Any]:
+        """run the upstream stages in a thread, connected by a bounded queue"""
+        import queue  # pylint: disable=import-outside-toplevel
+        buffer: 'queue.Queue[Any]' = queue.Queue(maxsize=self.buffer_size)
+        stopped = threading.Event()
+        producer = threading.Thread(
+            target=_produce_chunks, args=(chunks, buffer, stopped, self._END), name='PipelineStage', daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is self._END:
+                    return
+                if isinstance(item, _StageError):
+                    raise item.error
+                yield item
+        finally:
+            stopped.set()
+            producer.join()
+
+    def run(self, source: Any) -> Iterator[Any]:
+        """returns an iterator over the chunks, which were processed by all modules"""
+        chunks: Iterator[Any] = _read_chunks(source, self.chunk_size)
+        for module, stats in zip(self.modules, self.stats):
+            chunks = self._stage(module, stats, chunks)
+            if self.buffer_size:
+                chunks = self._buffered(chunks)
+        return chunks
+
+    def process(self, source: Any) -> None:
+        """process all chunks and discard the results"""
+        for _ in self.run(source):
+            pass
+
+
+def _get_running_loop() -> 'asyncio.AbstractEventLoop':
+    import asyncio  # pylint: disable=import-outside-toplevel
+    # asyncio.get_running_loop was added in Python 3.7, get_event_loop returns the running loop in a coroutine
+    return getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+
+
+class AsyncPipeline():
+    """Streams data chunks through a chain of modules on an asyncio event loop
+
+    Modules can define ``async def execute``, which is awaited on the event loop.
+    Synchronous execute methods are run in a thread pool, so a slow module does not block other streams.
+    The modules are instantiated once and shared by all streams, so synchronous modules must be thread safe.
+
+    Each call of :meth:`run` processes one stream. Many streams can be processed concurrently with :meth:`run_many`.
+    """
+
+    def __init__(
+        self,
+        modules: Sequence[Union[Type[BaseModule], BaseModule]],
+        args: Optional[Sequence[Text]] = None,
+        executor: Optional['concurrent.futures.Executor'] = None,
+        chunk_size: int = 65536
+    ) -> None:
+        self.modules: List[BaseModule] = _create_pipeline_modules(modules, args)
+        self.executor: Optional['concurrent.futures.Executor'] = executor
+        self.chunk_size: int = chunk_size
+        self.stats: List[StageStats] = [StageStats(type(module).__name__) for module in self.modules]
+
+    async def _read(self, source: Any) -> AsyncIterator[Any]:
+        if hasattr(source, '__aiter__'):
+            async for chunk in source:
+                yield chunk
+        elif hasattr(source, 'read') and inspect.iscoroutinefunction(source.read):
+            while True:
+                chunk = await source.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        else:
+            # synchronous sources are read in the executor, so a blocking read does not stall other streams
+            loop = _get_running_loop()
+            chunks = _read_chunks(source, self.chunk_size)
+            end = object()
+            while True:
+                chunk = await loop.run_in_executor(self.executor, next, chunks, end)
+                if chunk is end:
+                    return
+                yield chunk
+
+    async def _stage(self, module: BaseModule, stats: StageStats, chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        execute = module.execute  # type: ignore
+        is_coroutine = inspect.iscoroutinefunction(execute)
+        loop = _get_running_loop()
+        async for chunk in chunks:
+            start = time.perf_counter()
+            if is_coroutine:
+                result = await execute(chunk)
+            else:
+                result = await loop.run_in_executor(self.executor, execute, chunk)
+            stats.seconds += time.perf_counter() - start
+            stats.chunks += 1
+            stats.bytes += len(chunk) if hasattr(chunk, '__len__') else 0
+            yield chunk if result is None else result
+
+    def run(self, source: Any) -> AsyncIterator[Any]:
+        """returns an async iterator over the chunks of a stream, which were processed by all modules
+
+        The source can be an async iterable, an object with an async read method (e.g. asyncio.StreamReader),
+        an iterable or a file-like object.
+        """
+        chunks: AsyncIterator[Any] = self._read(source)
+        for module, stats in zip(self.modules, self.stats):
+            chunks = self._stage(module, stats, chunks)
+        return chunks
+
+    async def process(self, source: Any) -> None:
+        """process all chunks of a stream and discard the results"""
+        async for _ in self.run(source):
+            pass
+
+    async def run_many(self, sources: Iterable[Any]) -> None:
+        """process multiple streams concurrently"""
+        import asyncio  # pylint: disable=import-outside-toplevel
+        await asyncio.gather(*[self.process(source) for source in sources])
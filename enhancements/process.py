@@ -1,6 +1,5 @@
 import fcntl
 import logging
-import pathlib
 import os
 from typing import Text
 
@@ -14,7 +13,7 @@ def pid_lock(pid_file: Text, message: Text = 'another instance is running') -> b
                 return False
         else:
             try:
-                pathlib.Path(pid_dir).mkdir(parents=True, exist_ok=True)
+                os.makedirs(pid_dir, exist_ok=True)
             except PermissionError:
                 logging.error('can not create output directory')
                 return False
@@ -1,18 +1,71 @@
+import array
 import operator
+import os
+import sys
+import threading
+import types
 from typing import (
     cast,
+    TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Hashable,
+    Iterable,
+    Iterator,
     List,
+    Mapping,
     Text,
     Type,
     Tuple,
     Optional,
+    Sequence,
+    Set,
     Union
 )
-from typeguard import typechecked
-from enhancements.config import ExtendedConfigParser
+from enhancements.typecheck import typechecked
+
+if TYPE_CHECKING or sys.version_info < (3, 7):
+    # module level __getattr__ (PEP 562) requires Python 3.7, so older versions import the config eagerly
+    from enhancements.config import ExtendedConfigParser
+
+
+def _import_numpy() -> Any:
+    """returns numpy, if it is installed, numpy is an optional dependency for the bulk scoring"""
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+    return numpy
+
+
+def __getattr__(name: Text) -> Any:
+    # the config module imports the module loader, so it is only imported when a CONFIGFILE is used
+    if name == 'ExtendedConfigParser':
+        from enhancements.config import ExtendedConfigParser  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        return ExtendedConfigParser
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+# class attributes, which are created, when the CONFIGFILE of a return code class is loaded
+CONFIG_ATTRIBUTES: Tuple[Text, ...] = ('config', '_results', '_results_by_name', '_result_types', '_min', '_max', '_initial')
+
+# environment variable with the production config, which is read by the ExtendedConfigParser
+CONFIG_FILE_ENV: Text = 'ENHANCED_CONFIG_FILE'
+
+_config_lock = threading.RLock()
+
+
+class _ConfigAttribute():
+    """placeholder of a CONFIG_ATTRIBUTES entry, which loads the CONFIGFILE on first access"""
+
+    def __init__(self, cls: 'ReturnCodeMeta', name: Text) -> None:
+        self.cls: 'ReturnCodeMeta' = cls
+        self.name: Text = name
+
+    def __get__(self, instance: Any, owner: 'ReturnCodeMeta') -> Any:
+        self.cls._configure(parser=self.name == 'config')
+        return getattr(owner, self.name)
 
 
 class MissingInnerResultClass(Exception):
@@ -27,6 +80,20 @@ class WrongResultValue(Exception):
     pass
 
 
+def _file_checksum(path: Text) -> Optional[Text]:
+    import hashlib  # pylint: disable=import-outside-toplevel
+    try:
+        with open(path, 'rb') as checkfile:
+            return hashlib.sha256(checkfile.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _pending_classes(classes: Iterable[type]) -> List['ReturnCodeMeta']:
+    """returns the classes with a CONFIGFILE, which was not loaded yet"""
+    return [klass for klass in classes if vars(klass).get('_config_pending')]
+
+
 class ReturnCodeMeta(type):
 
     def __new__(cls, name: Text, bases: Tuple[type], dct: Dict[str, Any]) -> 'ReturnCodeMeta':
@@ -35,36 +102,168 @@ class ReturnCodeMeta(type):
         if 'BaseReturnCode.Result' not in result_basesclasses and 'int' not in result_basesclasses:
             raise WrongResultSubclass()
         x.Result.BASERESULT = x
-        if x.CONFIGFILE:
-            configfile = ExtendedConfigParser(defaultini=x.CONFIGFILE)
-            x.config = configfile
-            for section in configfile.sections():
-                if not section.startswith('Result:'):
-                    continue
-
-                result_name = section.split(':', 1)[1]
-                result_value: 'BaseReturnCode.Result' = x.Result(
-                    result_name,
-                    configfile.getint(section, 'value'),
-                    configfile.getboolean(section, 'skip')
-                )
-                setattr(x, result_name.capitalize(), result_value)
-                setattr(x, result_name.lower(), x.Action(x, result_value))
         baseclass_dict: Dict[Text, Type['BaseReturnCode']] = {b.__qualname__: cast(Type['BaseReturnCode'], b) for b in x.__bases__}
         baseclass: Optional[Type['BaseReturnCode']] = baseclass_dict.get('BaseReturnCode', None)
         if baseclass:
             for r in [a for a in x.__dict__.values() if isinstance(a, baseclass.Result)]:
                 if not isinstance(r, x.Result):
                     raise WrongResultValue()
+        if x.CONFIGFILE:
+            # the results are loaded from the CONFIGFILE on first access, the default config is searched
+            # in the package of the module, which defines the class
+            type.__setattr__(x, '_config_package', dct.get('__module__', '').split('.')[0] or None)
+            type.__setattr__(x, '_config_pending', True)
+            for attribute in CONFIG_ATTRIBUTES:
+                type.__setattr__(x, attribute, _ConfigAttribute(x, attribute))
+        else:
+            # results are inherited, so the results of base classes must be loaded first
+            for base in _pending_classes(x.__mro__[1:]):
+                base._configure()
+            x._build_tables()
         return x
 
+    def __getattr__(cls, name: Text) -> Any:
+        # results and actions of a CONFIGFILE are only known, after the file was loaded
+        pending = _pending_classes(cls.__mro__)
+        if pending and not name.startswith('__'):
+            for klass in pending:
+                klass._configure()
+            return getattr(cls, name)
+        raise AttributeError("type object {!r} has no attribute {!r}".format(cls.__name__, name))
+
+    def __setattr__(cls, name: Text, value: Any) -> None:
+        if vars(cls).get('_config_pending'):
+            cls._configure()
+        super().__setattr__(name, value)
+        if not name.startswith('_') and isinstance(value, getattr(cls, 'Result', ())):
+            cls._build_tables()
+
+    def _configure(cls, parser: bool = False) -> None:
+        """load the results from the CONFIGFILE
+
+        The result definitions are stored in the cache directory, so the ini files are only parsed again,
+        when one of them was changed. The ExtendedConfigParser is only created, if parser is True
+        or the cache can not be used.
+        """
+        x = cast(Type['BaseReturnCode'], cls)
+        with _config_lock:
+            pending = vars(x).get('_config_pending')
+            if pending:
+                # results are inherited, so the results of base classes must be loaded first
+                for base in _pending_classes(x.__mro__[1:]):
+                    base._configure()
+                definitions = None if parser else x._read_definitions()
+                if definitions is None:
+                    definitions = x._compile_definitions(x._load_config())
+                for result_name, value, skip in definitions['results']:
+                    result_value: 'BaseReturnCode.Result' = x.Result(result_name, value, skip)
+                    type.__setattr__(x, result_name.capitalize(), result_value)
+                    type.__setattr__(x, result_name.lower(), x.Action(x, result_value))
+                if definitions['initial'] is None:
+                    # without an initial result in the CONFIGFILE, the initial result of the base classes is used
+                    type.__delattr__(x, '_initial')
+                else:
+                    type.__setattr__(x, '_initial', definitions['initial'])
+                type.__setattr__(x, '_config_pending', False)
+                x._build_tables()
+            if parser and isinstance(vars(x).get('config'), _ConfigAttribute):
+                x._load_config()
+
+    def _load_config(cls) -> 'ExtendedConfigParser':
+        from enhancements.config import ExtendedConfigParser  # pylint: disable=import-outside-toplevel,redefined-outer-name
+        x = cast(Type['BaseReturnCode'], cls)
+        configfile = ExtendedConfigParser(defaultini=x.CONFIGFILE, package=x._config_package)
+        type.__setattr__(x, 'config', configfile)
+        return configfile
+
+    def _definitions_cache(cls) -> Optional[Tuple[Text, Text]]:
+        """returns the name and key of the cached definitions, which depend on the content of the default config"""
+        x = cast(Type['BaseReturnCode'], cls)
+        # the package of the class is already imported, so the default config is found without the module loader
+        package_file: Optional[Text] = getattr(sys.modules.get(x._config_package or ''), '__file__', None)
+        if not package_file:
+            return None
+        defaultconfig = os.path.join(os.path.dirname(package_file), 'data', *x.CONFIGFILE.split('/'))
+        try:
+            with open(defaultconfig, 'rb') as configfile:
+                content = configfile.read()
+        except OSError:
+            return None
+        import hashlib  # pylint: disable=import-outside-toplevel
+        name = 'returncode-{}.json'.format(hashlib.sha256(defaultconfig.encode('utf-8', 'surrogateescape')).hexdigest()[:16])
+        key = hashlib.sha256(content + b'\0' + os.environ.get(CONFIG_FILE_ENV, '').encode('utf-8', 'surrogateescape'))
+        return name, key.hexdigest()
+
+    def _read_definitions(cls) -> Optional[Dict[Text, Any]]:
+        from enhancements.cache import read_cache  # pylint: disable=import-outside-toplevel
+        cache = cls._definitions_cache()
+        definitions = read_cache(*cache) if cache else None
+        if not isinstance(definitions, dict):
+            return None
+        # production configs are checked by content, because they can also be changed without changing the default config
+        for path, checksum in definitions.get('files', {}).items():
+            if _file_checksum(path) != checksum:
+                return None
+        return definitions
+
+    def _compile_definitions(cls, configfile: 'ExtendedConfigParser') -> Dict[Text, Any]:
+        """convert the Result sections of a config to a json serializable form and store it in the cache"""
+        from enhancements.cache import write_cache  # pylint: disable=import-outside-toplevel
+        results = []
+        for section in configfile.sections():
+            if not section.startswith('Result:'):
+                continue
+            results.append((
+                section.split(':', 1)[1], configfile.getint(section, 'value'), configfile.getboolean(section, 'skip')
+            ))
+        definitions = {
+            'results': results,
+            'initial': configfile.get('Result', 'initial') if configfile.has_option('Result', 'initial') else None,
+            'files': {path: _file_checksum(path) for path in configfile.configfiles if path != configfile.default_config}
+        }
+        cache = cls._definitions_cache()
+        if cache:
+            write_cache(cache[0], cache[1], definitions)
+        return definitions
+
+    def _build_tables(cls) -> None:
+        """create the lookup tables of the results, which are used by convert, min and max
+
+        Results are inherited like attributes, a result of a subclass replaces a result with the same attribute name.
+        """
+        x = cast(Type['BaseReturnCode'], cls)
+        attributes: Dict[Text, 'BaseReturnCode.Result'] = {}
+        for klass in reversed(x.__mro__):
+            for attrname, value in vars(klass).items():
+                # _min and _max are lookup tables and not results of the class
+                if isinstance(value, x.Result) and not attrname.startswith('_'):
+                    attributes[attrname] = value
+        results = {int(result): result for result in attributes.values()}
+        names = {result.string.casefold(): result for result in attributes.values()}
+        type.__setattr__(x, '_results', types.MappingProxyType(results))
+        type.__setattr__(x, '_results_by_name', types.MappingProxyType(names))
+        type.__setattr__(x, '_result_types', tuple(result.string for result in attributes.values()))
+        type.__setattr__(x, '_min', results[min(results)] if results else None)
+        type.__setattr__(x, '_max', results[max(results)] if results else None)
+
 
 class BaseReturnCode(metaclass=ReturnCodeMeta):
 
-    config: ExtendedConfigParser
+    config: 'ExtendedConfigParser'
     CONFIGFILE: Optional[Text] = None
     COMPERATOR: Callable[[Any, Any], bool] = operator.gt
 
+    # lookup tables, which are created by ReturnCodeMeta
+    _results: Mapping[int, 'BaseReturnCode.Result']
+    _results_by_name: Mapping[Text, 'BaseReturnCode.Result']
+    _result_types: Tuple[Text, ...]
+    _min: Optional['BaseReturnCode.Result']
+    _max: Optional['BaseReturnCode.Result']
+    # configuration of classes with a CONFIGFILE, which is loaded on first access
+    _config_package: Optional[Text] = None
+    _config_pending: bool = False
+    _initial: Optional[Text] = None
+
     class Action():
         @typechecked
         def __init__(self, cls: Type['BaseReturnCode'], result: 'BaseReturnCode.Result') -> None:
@@ -100,29 +299,42 @@ class BaseReturnCode(metaclass=ReturnCodeMeta):
         def __hash__(self) -> int:
             return int(self)
 
-        @typechecked
+        # The comparison operators are not typechecked, because they accept any value and are called very often.
+        # Results of the same class are compared as ints, other values are converted first.
+        def _coerce(self, other: Any) -> int:
+            if isinstance(other, BaseReturnCode.Result) and other.BASERESULT is self.BASERESULT:
+                return other
+            return self.convert(other)
+
         def __eq__(self, other: Any) -> bool:
-            return super().__eq__(self.convert(other))
+            if other.__class__ is not self.__class__:
+                other = self._coerce(other)
+            return int.__eq__(self, other)
 
-        @typechecked
         def __ne__(self, other: Any) -> bool:
-            return super().__ne__(self.convert(other))
+            if other.__class__ is not self.__class__:
+                other = self._coerce(other)
+            return int.__ne__(self, other)
 
-        @typechecked
         def __lt__(self, other: Any) -> bool:
-            return super().__lt__(self.convert(other))
+            if other.__class__ is not self.__class__:
+                other = self._coerce(other)
+            return int.__lt__(self, other)
 
-        @typechecked
         def __gt__(self, other: Any) -> bool:
-            return super().__gt__(self.convert(other))
+            if other.__class__ is not self.__class__:
+                other = self._coerce(other)
+            return int.__gt__(self, other)
 
-        @typechecked
         def __le__(self, other: Any) -> bool:
-            return super().__le__(self.convert(other))
+            if other.__class__ is not self.__class__:
+                other = self._coerce(other)
+            return int.__le__(self, other)
 
-        @typechecked
         def __ge__(self, other: Any) -> bool:
-            return super().__ge__(self.convert(other))
+            if other.__class__ is not self.__class__:
+                other = self._coerce(other)
+            return int.__ge__(self, other)
 
         @classmethod
         @typechecked
@@ -149,30 +361,156 @@ class BaseReturnCode(metaclass=ReturnCodeMeta):
     @classmethod
     @typechecked
     def min(cls) -> 'BaseReturnCode.Result':
-        return cls.convert(min(cls.get_results().keys()))
+        if cls._min is None:
+            raise ValueError('{} has no results'.format(cls.__name__))
+        return cls._min
 
     @classmethod
     @typechecked
     def max(cls) -> 'BaseReturnCode.Result':
-        return cls.convert(max(cls.get_results().keys()))
+        if cls._max is None:
+            raise ValueError('{} has no results'.format(cls.__name__))
+        return cls._max
 
     @classmethod
     @typechecked
     def get_score(cls, *returnvalues: 'BaseReturnCode.Result') -> 'BaseReturnCode.Result':
-        if cls.CONFIGFILE:
-            result = cls.convert(cls.config.get('Result', 'initial'))
-        else:
-            result = cls.min()
+        result = cls._initial_score()
         for value_arg in returnvalues:
-            value: 'BaseReturnCode.Result' = cls.convert(value_arg)
+            value: 'BaseReturnCode.Result' = value_arg if value_arg.__class__ is cls.Result else cls.convert(value_arg)
             if value.skip:
                 continue
             if cls._compare(value, result):
                 result = value
         return result
 
+    @classmethod
+    def accumulator(cls) -> 'ResultAccumulator':
+        """returns a thread safe accumulator of the score of this class"""
+        return ResultAccumulator(cls)
+
+    @classmethod
+    def result_log(cls, results: Iterable[Any] = ()) -> 'ResultLog':
+        """returns a compact log of results of this class, which stores the int codes in an array"""
+        return ResultLog(cls, results)
+
+    @classmethod
+    def histogram(cls, workers: int = 1) -> 'ResultHistogram':
+        """returns a histogram of the results of this class in shared memory with a row for each worker process"""
+        return ResultHistogram(cls, workers)
+
+    @classmethod
+    def _initial_score(cls) -> 'BaseReturnCode.Result':
+        if cls.CONFIGFILE:
+            if cls._initial is not None:
+                return cls.convert(cls._initial)
+            return cls.convert(cls.config.get('Result', 'initial'))
+        return cls.min()
+
+    @classmethod
+    def _bulk_reduction(cls) -> Optional[Text]:
+        """returns "max" or "min", if the COMPERATOR can be replaced by a reduction of the int values"""
+        if cls.COMPERATOR in (operator.gt, operator.ge):
+            return 'max'
+        if cls.COMPERATOR in (operator.lt, operator.le):
+            return 'min'
+        return None
+
+    @classmethod
+    @typechecked
+    def get_bulk_score(cls, codes: Iterable[int]) -> 'BaseReturnCode.Result':
+        """returns the same score as get_score for a large number of int codes or results
+
+        Codes can be an iterable or a numpy array. If numpy is installed, the codes are reduced
+        with vectorized operations, otherwise with builtin functions.
+        """
+        initial = cls._initial_score()
+        reduction = cls._bulk_reduction()
+        if reduction is None:
+            return cls.get_score(*[cls.convert(int(code)) for code in codes])
+        numpy = _import_numpy()
+        if numpy is None:
+            skip = cls._skip_codes()
+            scored = [code for code in cls._check_codes(codes) if code not in skip]
+            if not scored:
+                return initial
+            best = max(scored) if reduction == 'max' else min(scored)
+        else:
+            array = cls._check_code_array(numpy, codes)
+            array = array[~numpy.isin(array, list(cls._skip_codes()))]
+            if not array.size:
+                return initial
+            best = int(array.max() if reduction == 'max' else array.min())
+        result = cls.convert(best)
+        return result if cls._compare(result, initial) else initial
+
     @classmethod
     @typechecked
+    def get_group_scores(cls, codes: Iterable[int], keys: Iterable[Hashable]) -> Dict[Hashable, 'BaseReturnCode.Result']:
+        """returns the score of each key, e.g. the score per host
+
+        The keys are matched with the codes by position. The score of each key is the same as get_score
+        for all codes of this key.
+        """
+        initial = cls._initial_score()
+        reduction = cls._bulk_reduction()
+        numpy = _import_numpy()
+        codes = codes if hasattr(codes, '__len__') else list(codes)
+        keys = keys if hasattr(keys, '__len__') else list(keys)
+        if len(codes) != len(keys):  # type: ignore
+            raise ValueError('codes and keys must have the same length')
+        key_array = cls._group_key_array(numpy, keys) if numpy is not None and reduction is not None else None
+        if key_array is None:
+            groups: Dict[Hashable, List[int]] = {}
+            for code, key in zip(cls._check_codes(codes), keys):
+                groups.setdefault(key, []).append(code)
+            return {key: cls.get_bulk_score(group) for key, group in groups.items()}
+
+        array = cls._check_code_array(numpy, codes)
+        if key_array.shape != array.shape:
+            raise ValueError('codes and keys must have the same length')
+        unique_keys, inverse = numpy.unique(key_array, return_inverse=True)
+        scores = numpy.full(len(unique_keys), int(initial), dtype=numpy.int64)
+        mask = ~numpy.isin(array, list(cls._skip_codes()))
+        ufunc = numpy.maximum if reduction == 'max' else numpy.minimum
+        ufunc.at(scores, inverse.reshape(-1)[mask], array[mask])
+        return {
+            key: initial if score == int(initial) else cls.convert(score)
+            for key, score in zip(unique_keys.tolist(), scores.tolist())
+        }
+
+    @staticmethod
+    def _group_key_array(numpy: Any, keys: Iterable[Hashable]) -> Any:
+        """returns the keys as numpy array or None, if numpy would change the keys (e.g. tuples, mixed types or None)"""
+        if not isinstance(keys, numpy.ndarray):
+            if len({type(key) for key in keys}) > 1:
+                return None
+            keys = numpy.asarray(keys)
+        if keys.ndim != 1 or keys.dtype.kind not in 'iuUS':
+            return None
+        return keys
+
+    @classmethod
+    def _skip_codes(cls) -> Set[int]:
+        return {code for code, result in cls._results.items() if result.skip}
+
+    @classmethod
+    def _check_codes(cls, codes: Iterable[int]) -> Iterator[int]:
+        results = cls._results
+        for code in codes:
+            code = int(code)
+            if code not in results:
+                raise ValueError("Not a valid return code")
+            yield code
+
+    @classmethod
+    def _check_code_array(cls, numpy: Any, codes: Iterable[int]) -> Any:
+        array = numpy.asarray(codes if hasattr(codes, '__len__') else list(codes), dtype=numpy.int64).reshape(-1)
+        if not numpy.isin(array, list(cls._results)).all():
+            raise ValueError("Not a valid return code")
+        return array
+
+    @classmethod
     def _compare(cls, a: Any, b: Any) -> bool:
         return cls.COMPERATOR(a, b)
 
@@ -188,24 +526,312 @@ class BaseReturnCode(metaclass=ReturnCodeMeta):
 
     @classmethod
     @typechecked
-    def get_results(cls) -> Dict[int, 'BaseReturnCode.Result']:
-        return {int(x): x for x in cls.__dict__.values() if isinstance(x, cls.Result)}
+    def get_results(cls) -> Mapping[int, 'BaseReturnCode.Result']:
+        return cls._results
 
     @classmethod
     @typechecked
-    def get_result_types(cls) -> List[Text]:
-        return [x.string for x in cls.__dict__.values() if isinstance(x, cls.Result)]
+    def get_result_types(cls) -> Sequence[Text]:
+        return cls._result_types
 
     @classmethod
     @typechecked
     def convert(cls, value: Any) -> 'BaseReturnCode.Result':
-        results = cls.get_results()
         if isinstance(value, cls.Result):
             return value
-        if isinstance(value, int) and value in results:
-            return results[value]
-        if isinstance(value, str):
-            for rating, result in results.items():
-                if value.lower() == result.string.lower():
-                    return results[rating]
-        raise ValueError("Not a valid return code")
+        result: Optional['BaseReturnCode.Result'] = None
+        if isinstance(value, int):
+            result = cls._results.get(value)
+        elif isinstance(value, str):
+            result = cls._results_by_name.get(value.casefold())
+        if result is None:
+            raise ValueError("Not a valid return code")
+        return result
+
+
+class ResultAccumulator():
+    """Thread safe score of a BaseReturnCode class, which is updated by many threads
+
+    Each thread keeps its own partial score, which is only written by this thread, so :meth:`offer`
+    does not need a lock. :meth:`snapshot` combines the partial scores of all threads like get_score.
+    The partial scores of finished threads are merged into a common score, so the number of partial scores
+    does not grow with the number of threads, which were started during the lifetime of the accumulator.
+    """
+
+    def __init__(self, returncode: Type[BaseReturnCode]) -> None:
+        self.returncode: Type[BaseReturnCode] = returncode
+        self._local = threading.local()
+        self._partials: List[Tuple[threading.Thread, List[BaseReturnCode.Result]]] = []
+        self._finished: BaseReturnCode.Result = returncode._initial_score()
+        self._lock = threading.Lock()
+
+    def _partial(self) -> List[BaseReturnCode.Result]:
+        """create the partial score of the current thread"""
+        partial = self._local.partial = [self.returncode._initial_score()]
+        with self._lock:
+            self._merge_finished()
+            self._partials.append((threading.current_thread(), partial))
+        return partial
+
+    def _merge_finished(self) -> None:
+        """merge the partial scores of finished threads, the lock must be held by the caller"""
+        finished = [partial[0] for thread, partial in self._partials if not thread.is_alive()]
+        if finished:
+            self._finished = self.returncode.get_score(self._finished, *finished)
+            self._partials = [(thread, partial) for thread, partial in self._partials if thread.is_alive()]
+
+    def offer(self, value: Any) -> bool:
+        """offer a result, returns True if the partial score of the current thread was changed"""
+        returncode = self.returncode
+        result = value if value.__class__ is returncode.Result else returncode.convert(value)
+        if result.skip:
+            return False
+        try:
+            partial = self._local.partial
+        except AttributeError:
+            partial = self._partial()
+        if returncode._compare(result, partial[0]):
+            partial[0] = result
+            return True
+        return False
+
+    def snapshot(self) -> BaseReturnCode.Result:
+        """returns the current score of all threads"""
+        with self._lock:
+            self._merge_finished()
+            partials = [partial[0] for _, partial in self._partials]
+            finished = self._finished
+        return self.returncode.get_score(finished, *partials)
+
+    @property
+    def result(self) -> BaseReturnCode.Result:
+        return self.snapshot()
+
+    def merge(self, other: 'ResultAccumulator') -> None:
+        """add the score of another accumulator of the same class to this accumulator"""
+        if other.returncode is not self.returncode:
+            raise ValueError('accumulators of different classes can not be merged')
+        self.offer(other.snapshot())
+
+
+class ResultHistogram():
+    """Counts the results of a BaseReturnCode class in shared memory
+
+    The histogram has a row of counters for each worker process, so workers increment their own row
+    without locks or IPC. A process, which was started with fork, uses the histogram of the parent.
+    Other processes attach to the histogram with its name.
+    The totals and the score can be read at any time from any process.
+
+    Requires Python 3.8 or newer (multiprocessing.shared_memory).
+    """
+
+    def __init__(self, returncode: Type[BaseReturnCode], workers: int = 1, name: Optional[Text] = None) -> None:
+        from multiprocessing import shared_memory  # pylint: disable=import-outside-toplevel
+        if workers < 1:
+            raise ValueError('histogram needs at least one worker')
+        self.returncode: Type[BaseReturnCode] = returncode
+        self.workers: int = workers
+        self.codes: Tuple[int, ...] = tuple(sorted(returncode.get_results()))
+        self._slots: Dict[int, int] = {code: slot for slot, code in enumerate(self.codes)}
+        self._owner: Optional[int] = os.getpid() if name is None else None
+        size = max(workers * len(self.codes), 1) * 8
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shm.buf[:size] = bytes(size)
+        else:
+            kwargs: Dict[Text, Any] = {'track': False} if sys.version_info >= (3, 13) else {}
+            self._shm = shared_memory.SharedMemory(name=name, **kwargs)
+            if not kwargs:
+                # before Python 3.13 attaching registers the segment with the resource tracker of this process,
+                # which would remove it, when this process exits
+                from multiprocessing import resource_tracker  # pylint: disable=import-outside-toplevel
+                resource_tracker.unregister(self._shm._name, 'shared_memory')  # pylint: disable=protected-access
+            if self._shm.size < size:
+                self._shm.close()
+                raise ValueError('shared memory {} is too small for the histogram'.format(name))
+        self._counts: memoryview = self._shm.buf[:size].cast('q')
+        self._closed: bool = False
+
+    @property
+    def name(self) -> Text:
+        """name of the shared memory, which is used to attach other processes"""
+        return cast(Text, self._shm.name)
+
+    def add(self, value: Any, worker: int = 0, count: int = 1) -> None:
+        """count a result in the row of the worker, each row must only be written by one process"""
+        if value.__class__ is int or getattr(value, 'BASERESULT', None) is self.returncode:
+            slot = self._slots.get(value)
+        else:
+            slot = None
+        if slot is None:
+            code = int(self.returncode.convert(value))
+            slot = self._slots.get(code)
+            if slot is None:
+                # the counters are created with the histogram, results which were added to the class later are not counted
+                raise ValueError('result code {} is not counted by the histogram'.format(code))
+        if not 0 <= worker < self.workers:
+            raise IndexError('worker {} out of range'.format(worker))
+        self._counts[worker * len(self.codes) + slot] += count
+
+    def counts(self) -> Dict[BaseReturnCode.Result, int]:
+        """returns the total count of each result of all workers"""
+        rows = self._counts.tolist()
+        width = len(self.codes)
+        return {
+            self.returncode.convert(code): sum(rows[slot::width])
+            for slot, code in enumerate(self.codes)
+        }
+
+    def score(self) -> BaseReturnCode.Result:
+        """returns the same score as get_score for all counted results"""
+        return self.returncode.get_bulk_score(int(result) for result, count in self.counts().items() if count)
+
+    def close(self) -> None:
+        """detach from the shared memory, the process which created the histogram also removes it"""
+        if self._closed:
+            return
+        self._closed = True
+        self._counts.release()
+        self._shm.close()
+        if self._owner == os.getpid():
+            self._shm.unlink()
+
+    def __enter__(self) -> 'ResultHistogram':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        self.close()
+
+
+class ResultLog():
+    """Sequence of results of a BaseReturnCode class, which are stored as int codes in an array
+
+    The array uses the smallest integer type for the codes of the class, usually one byte per result.
+    The names of the results are only stored once by the class. Items are returned as results of the class.
+    :meth:`memoryview` exports the codes without a copy, e.g. for numpy.frombuffer or writing to a socket.
+    """
+
+    # array typecodes ordered by size
+    TYPECODES: Tuple[Text, ...] = ('b', 'h', 'i', 'q')
+
+    def __init__(self, returncode: Type[BaseReturnCode], results: Iterable[Any] = ()) -> None:
+        self.returncode: Type[BaseReturnCode] = returncode
+        codes = returncode.get_results()
+        self._codes: array.array = array.array(self._typecode(min(codes, default=0), max(codes, default=0)))
+        self.extend(results)
+
+    @classmethod
+    def _typecode(cls, low: int, high: int) -> Text:
+        for typecode in cls.TYPECODES:
+            limit = 2 ** (array.array(typecode).itemsize * 8 - 1)
+            if -limit <= low and high < limit:
+                return typecode
+        raise OverflowError('return code out of range')
+
+    def _code(self, value: Any) -> int:
+        results = self.returncode._results
+        if value.__class__ is int or getattr(value, 'BASERESULT', None) is self.returncode:
+            if value not in results:
+                raise ValueError("Not a valid return code")
+            return int(value)
+        return int(self.returncode.convert(value))
+
+    def _reserve(self, codes: Sequence[int]) -> None:
+        """use a larger typecode, if the codes do not fit into the array, e.g. results added after the log was created"""
+        if not codes:
+            return
+        typecode = self._typecode(min(codes), max(codes))
+        if self.TYPECODES.index(typecode) > self.TYPECODES.index(self._codes.typecode):
+            self._codes = array.array(typecode, self._codes)
+
+    def append(self, value: Any) -> None:
+        code = self._code(value)
+        try:
+            self._codes.append(code)
+        except OverflowError:
+            self._reserve([code])
+            self._codes.append(code)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        if isinstance(values, ResultLog) and values.returncode is self.returncode:
+            codes: Sequence[int] = values._codes
+        else:
+            codes = [self._code(value) for value in values]
+        self._reserve(codes)
+        if isinstance(codes, array.array) and codes.typecode != self._codes.typecode:
+            codes = array.array(self._codes.typecode, codes)
+        self._codes.extend(codes)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __iter__(self) -> Iterator[BaseReturnCode.Result]:
+        return map(self.returncode._results.__getitem__, self._codes)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            log = ResultLog(self.returncode)
+            log._codes = self._codes[index]
+            return log
+        return self.returncode._results[self._codes[index]]
+
+    @property
+    def typecode(self) -> Text:
+        """array typecode of the stored codes"""
+        return cast(Text, self._codes.typecode)
+
+    @property
+    def nbytes(self) -> int:
+        """size of the stored codes in bytes"""
+        return len(self._codes) * self._codes.itemsize
+
+    def memoryview(self) -> memoryview:
+        """returns a view of the codes without copying them, the view must be released before appending to the log"""
+        return memoryview(self._codes)
+
+    def score(self) -> BaseReturnCode.Result:
+        """returns the same score as get_score for all results of the log"""
+        numpy = _import_numpy()
+        if numpy is None:
+            # the codes were checked, when they were added, so only the distinct codes must be scored
+            return self.returncode.get_bulk_score(set(self._codes))
+        return self.returncode.get_bulk_score(numpy.frombuffer(self._codes, dtype=self._codes.typecode))
+
+    def save(self, path: Text) -> None:
+        """write the log to a file, the file starts with a json header, which contains the name table of the class"""
+        header = {
+            'returncode': '{}.{}'.format(self.returncode.__module__, self.returncode.__qualname__),
+            'itemsize': self._codes.itemsize,
+            'byteorder': sys.byteorder,
+            'results': {str(code): [result.string, result.skip] for code, result in self.returncode.get_results().items()}
+        }
+        import json  # pylint: disable=import-outside-toplevel
+        with open(path, 'wb') as logfile:
+            logfile.write(json.dumps(header).encode('utf-8') + b'\n')
+            self._codes.tofile(logfile)
+
+    @classmethod
+    def load(cls, returncode: Type[BaseReturnCode], path: Text) -> 'ResultLog':
+        """read a log, which was written by :meth:`save`, the results of the file must be results of returncode"""
+        import json  # pylint: disable=import-outside-toplevel
+        with open(path, 'rb') as logfile:
+            header = json.loads(logfile.readline().decode('utf-8'))
+            data = logfile.read()
+        results = returncode.get_results()
+        for code, (name, _) in header['results'].items():
+            if int(code) not in results or results[int(code)].string != name:
+                raise ValueError('result {} ({}) of {} is not a result of {}'.format(
+                    name, code, header['returncode'], returncode.__qualname__
+                ))
+        typecodes = [typecode for typecode in cls.TYPECODES if array.array(typecode).itemsize == header['itemsize']]
+        if not typecodes:
+            raise ValueError('unsupported item size {}'.format(header['itemsize']))
+        log = cls(returncode)
+        log._codes = array.array(typecodes[0])
+        log._codes.frombytes(data)
+        if header['byteorder'] != sys.byteorder:
+            log._codes.byteswap()
+        unknown = set(log._codes) - results.keys()
+        if unknown:
+            raise ValueError('{} contains unknown results {}'.format(path, sorted(unknown)))
+        return log
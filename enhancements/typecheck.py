@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+"""Configurable runtime type checking
+
+The functions of this package are decorated with :func:`typechecked` instead of typeguard's decorator.
+The mode is read from the environment variable ``ENHANCEMENTS_TYPECHECK`` when this module is imported:
+
+    - full -- every call is checked by typeguard (default)
+    - off -- the original functions are used without a wrapper
+    - sampled[:interval] -- only every n-th call is checked (default interval: 100)
+
+The mode can also be changed with :func:`set_typecheck_mode`, but this must be done before
+the modules of this package are imported, because the mode is applied when the functions are decorated.
+
+typeguard is imported and applied on the first call of a checked function, so importing
+a module of this package does not pay for the import of typeguard.
+"""
+
+import functools
+import itertools
+import logging
+import os
+from typing import (
+    Any,
+    Callable,
+    Text,
+    Tuple,
+    Optional,
+    TypeVar
+)
+
+
+TYPECHECK_ENV: Text = 'ENHANCEMENTS_TYPECHECK'
+
+TYPECHECK_OFF: Text = 'off'
+TYPECHECK_FULL: Text = 'full'
+TYPECHECK_SAMPLED: Text = 'sampled'
+
+TYPECHECK_MODES: Tuple[Text, ...] = (TYPECHECK_OFF, TYPECHECK_FULL, TYPECHECK_SAMPLED)
+DEFAULT_SAMPLE_INTERVAL: int = 100
+
+FunctionType = TypeVar('FunctionType', bound=Callable[..., Any])
+
+
+def _parse_mode(value: Text) -> Tuple[Text, int]:
+    mode, _, interval = value.strip().lower().partition(':')
+    if mode not in TYPECHECK_MODES:
+        raise ValueError('unknown typecheck mode {}! Valid modes are: {}'.format(mode, ", ".join(TYPECHECK_MODES)))
+    sample_interval = int(interval) if interval else DEFAULT_SAMPLE_INTERVAL
+    if sample_interval < 1:
+        raise ValueError('sample interval must be greater than 0')
+    return mode, sample_interval
+
+
+_mode, _sample_interval = _parse_mode(os.environ.get(TYPECHECK_ENV) or TYPECHECK_FULL)
+_applied: bool = False
+
+
+def get_typecheck_mode() -> Text:
+    return _mode
+
+
+def set_typecheck_mode(mode: Text, sample_interval: int = DEFAULT_SAMPLE_INTERVAL) -> None:
+    """set the typecheck mode for all functions decorated after this call
+    """
+    global _mode, _sample_interval  # pylint: disable=global-statement
+    if _applied:
+        logging.warning("typecheck mode changed after functions were decorated. Import enhancements modules afterwards.")
+    _mode, _sample_interval = _parse_mode('{}:{}'.format(mode, sample_interval))
+
+
+def _lazy_typechecked(func: FunctionType) -> Callable[[], Callable[..., Any]]:
+    """returns a function, which creates the typeguard wrapper of func on the first call"""
+    checked_func: Optional[Callable[..., Any]] = None
+
+    def get_checked_func() -> Callable[..., Any]:
+        nonlocal checked_func
+        if checked_func is None:
+            from typeguard import typechecked as typeguard_typechecked  # pylint: disable=import-outside-toplevel
+            checked_func = typeguard_typechecked(func)
+        return checked_func
+    return get_checked_func
+
+
+def typechecked(func: FunctionType) -> FunctionType:
+    """typecheck decorator, which applies the current typecheck mode
+    """
+    global _applied  # pylint: disable=global-statement
+    _applied = True
+    if _mode == TYPECHECK_OFF:
+        return func
+    checked_func = _lazy_typechecked(func)
+    if _mode == TYPECHECK_FULL:
+        @functools.wraps(func)
+        def full_func(*args: Any, **kwargs: Any) -> Any:
+            return checked_func()(*args, **kwargs)
+        return full_func  # type: ignore
+
+    counter = itertools.count()
+    sample_interval = _sample_interval
+
+    @functools.wraps(func)
+    def sampled_func(*args: Any, **kwargs: Any) -> Any:
+        if next(counter) % sample_interval:
+            return func(*args, **kwargs)
+        return checked_func()(*args, **kwargs)
+    return sampled_func  # type: ignore
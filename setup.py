@@ -46,5 +46,8 @@ setup(
     install_requires=[
         'argcomplete',
         'typeguard'
-    ]
+    ],
+    extras_require={
+        'numpy': ['numpy']
+    }
 )
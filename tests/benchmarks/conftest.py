@@ -0,0 +1,108 @@
+# type: ignore
+
+"""Benchmarks of the hot paths, which are compared with a stored baseline
+
+The benchmarks are skipped, unless pytest is started with ``--benchmark`` or the environment
+variable ``ENHANCEMENTS_BENCHMARK`` is set. A benchmark fails, if it is slower than the baseline
+multiplied by the threshold (``ENHANCEMENTS_BENCHMARK_THRESHOLD``, default: 1.5).
+
+The baseline is stored in ``baseline.json`` next to this file or in ``ENHANCEMENTS_BENCHMARK_BASELINE``.
+Timings depend on the machine, so the baseline is not part of the repository. Create it with
+``--benchmark-update`` before measuring a change. Results are only compared, if the host, the cpu,
+the python version and the typecheck mode match the baseline, otherwise the comparison is skipped.
+"""
+
+import json
+import os
+import platform
+import timeit
+import warnings
+
+import pytest
+
+from enhancements.typecheck import get_typecheck_mode
+
+
+BASELINE_FILE = os.environ.get('ENHANCEMENTS_BENCHMARK_BASELINE') or os.path.join(os.path.dirname(__file__), 'baseline.json')
+THRESHOLD = float(os.environ.get('ENHANCEMENTS_BENCHMARK_THRESHOLD') or 1.5)
+
+
+def cpu_model():
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8') as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def environment():
+    return {
+        'host': platform.node(),
+        'machine': platform.machine(),
+        'cpu': cpu_model(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'typecheck': get_typecheck_mode()
+    }
+
+
+class BenchmarkSession():
+
+    def __init__(self, update):
+        self.update = update
+        self.results = {}
+        self.skipped = []
+        try:
+            with open(BASELINE_FILE, 'r', encoding='utf-8') as baseline_file:
+                self.baseline = json.load(baseline_file)
+        except (OSError, ValueError):
+            self.baseline = {'environment': None, 'results': {}}
+
+    def measure(self, name, func, number, repeat=5):
+        """measure the seconds per call of func and compare the result with the baseline"""
+        return self.record(name, min(timeit.repeat(func, number=number, repeat=repeat)) / number)
+
+    def record(self, name, seconds):
+        """compare a timing, which was measured by the benchmark, with the baseline"""
+        self.results[name] = seconds
+        baseline = self.baseline['results'].get(name)
+        if self.update:
+            return seconds
+        if baseline is None or self.baseline['environment'] != environment():
+            # timings of other machines can not be compared
+            self.skipped.append(name)
+            return seconds
+        assert seconds <= baseline * THRESHOLD, '{}: {:.2f} us per call, baseline {:.2f} us (threshold {})'.format(
+            name, seconds * 1e6, baseline * 1e6, THRESHOLD
+        )
+        return seconds
+
+    def store(self):
+        results = dict(self.baseline['results']) if self.baseline['environment'] == environment() else {}
+        results.update(self.results)
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as baseline_file:
+            json.dump({'environment': environment(), 'results': results}, baseline_file, indent=4, sort_keys=True)
+            baseline_file.write('\n')
+
+
+@pytest.fixture(scope='session')
+def benchmark_session(request):
+    update = request.config.getoption('--benchmark-update')
+    if not (update or request.config.getoption('--benchmark') or os.environ.get('ENHANCEMENTS_BENCHMARK')):
+        pytest.skip('benchmarks are disabled, use --benchmark or ENHANCEMENTS_BENCHMARK=1')
+    session = BenchmarkSession(update)
+    yield session
+    if update and session.results:
+        session.store()
+    elif session.skipped:
+        warnings.warn('no matching benchmark baseline for {} benchmarks, create it with --benchmark-update'.format(
+            len(session.skipped)
+        ))
+
+
+@pytest.fixture
+def benchmark(benchmark_session):
+    return benchmark_session.measure
@@ -0,0 +1,131 @@
+# type: ignore
+
+import io
+import os
+import sys
+
+import pytest
+
+from enhancements.config import ExtendedConfigParser
+from enhancements.examples import HexDump
+from enhancements.modules import BaseModule, EntryPointIndex, ImportlibMetadataBackend, ModuleParser
+from enhancements.returncode import BaseReturnCode
+
+
+class ScanResult(BaseReturnCode):
+    Success = BaseReturnCode.Result('success', 10)
+    Skip = BaseReturnCode.Result('skip', 11, skip=True)
+    Warning = BaseReturnCode.Result('warning', 12)
+    Error = BaseReturnCode.Result('error', 13)
+
+
+def create_module_tree(modules, depth):
+    """create a baseclass with a number of top level modules, each with a chain of submodules"""
+    class BenchmarkModule(BaseModule):
+        pass
+
+    top_level = []
+    for index in range(modules):
+        chain = [type('BenchmarkModule{}_{}'.format(index, level), (BenchmarkModule, ), {}) for level in range(depth)]
+        for level, module in enumerate(chain[:-1]):
+            module.parser().add_argument('--option-{}-{}'.format(index, level), default=level)
+            module.add_module(
+                '--submodule-{}-{}'.format(index, level + 1),
+                dest='submodule_{}_{}'.format(index, level + 1),
+                default=chain[level + 1],
+                baseclass=BenchmarkModule
+            )
+        top_level.append(chain[0])
+    return BenchmarkModule, top_level
+
+
+@pytest.mark.parametrize('modules, depth', [(1, 1), (4, 4), (16, 4)])
+def test_parse_args(benchmark, modules, depth):
+    baseclass, top_level = create_module_tree(modules, depth)
+
+    def parse_args():
+        parser = ModuleParser(default=top_level[0], baseclass=baseclass, baseclass_as_default=False)
+        for index, module in enumerate(top_level[1:], 1):
+            parser.add_module('--module-{}'.format(index), dest='module_{}'.format(index), default=module, baseclass=baseclass)
+        parser.parse_args([])
+    benchmark('parse_args[{}x{}]'.format(modules, depth), parse_args, number=10)
+
+
+@pytest.fixture
+def distributions(tmp_path, monkeypatch):
+    for index in range(200):
+        dist_info = tmp_path / 'benchmark_dist_{}-1.0.dist-info'.format(index)
+        dist_info.mkdir()
+        (dist_info / 'METADATA').write_text('Metadata-Version: 2.1\nName: benchmark-dist-{}\nVersion: 1.0\n'.format(index))
+        (dist_info / 'entry_points.txt').write_text(
+            '[BenchmarkModule]\n'
+            + ''.join('module{0}_{1} = benchmark_dist_{0}:Module{1}\n'.format(index, entry) for entry in range(5))
+        )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8), reason='importlib.metadata requires Python 3.8')
+def test_entry_point_discovery(benchmark, distributions, monkeypatch):
+    backend = ImportlibMetadataBackend()
+
+    def scan():
+        assert len(EntryPointIndex(backend).scan()['BenchmarkModule']) == 1000
+    benchmark('entry_point_discovery[scan]', scan, number=3)
+
+    assert EntryPointIndex(backend).index
+
+    def cached():
+        assert len(EntryPointIndex(backend).group('BenchmarkModule')) == 1000
+    benchmark('entry_point_discovery[cached]', cached, number=10)
+
+
+def test_module_instantiation(benchmark):
+    benchmark('module_instantiation', lambda: HexDump(['--hexwidth', '8']), number=2000)
+    benchmark('module_instantiation[kwargs]', lambda: HexDump(['--hexwidth', '8'], hexwidth=4), number=2000)
+
+
+def test_returncode(benchmark):
+    values = [ScanResult.Success, 'warning', 13, 'skip'] * 25
+    benchmark('returncode_convert', lambda: [ScanResult.convert(value) for value in values], number=10)
+    results = [ScanResult.convert(value) for value in values]
+    benchmark('returncode_get_score', lambda: ScanResult.get_score(*results), number=10)
+    benchmark('returncode_compare', lambda: [result > ScanResult.Warning for result in results], number=100)
+
+
+@pytest.fixture
+def configfile(tmp_path):
+    config = tmp_path / 'benchmark.ini'
+    config.write_text(''.join(
+        '[Section{0}]\nenabled = true\nclass = enhancements.examples.HexDump\n'
+        'items = a, b, c, d\nflag = yes\nname = section{0}\n\n'.format(index)
+        for index in range(50)
+    ))
+    return str(config)
+
+
+def test_config(benchmark, configfile):
+    def create():
+        return ExtendedConfigParser(productionini=configfile, package='enhancements', ignore_missing_default_config=True)
+    benchmark('config_create', create, number=20)
+
+    config = create()
+
+    def getters():
+        for index in range(50):
+            section = 'Section{}'.format(index)
+            config.getlist(section, 'items')
+            config.getboolean_or_string(section, 'flag')
+            config.getboolean_or_string(section, 'name')
+            config.getmodule(section)
+    benchmark('config_getters', getters, number=20)
+
+
+def test_hexdump_throughput(benchmark):
+    data = os.urandom(256 * 1024)
+    hex_dump = HexDump([], sink=io.StringIO())
+
+    def execute():
+        hex_dump.sink = io.StringIO()
+        hex_dump.execute(data)
+    benchmark('hexdump[256KiB]', execute, number=3)
@@ -0,0 +1,32 @@
+# type: ignore
+
+import os
+import re
+import subprocess  # nosec
+import sys
+
+import pytest
+
+
+def import_time(module, repeat=7):
+    """cumulative import time of a module in a new interpreter, measured with -X importtime"""
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+            check=True, stderr=subprocess.PIPE, env=dict(os.environ, PYTHONDONTWRITEBYTECODE='')
+        )  # nosec
+        match = re.search(r'\|\s*(\d+) \| {}$'.format(re.escape(module)), output.stderr.decode(), re.MULTILINE)
+        timings.append(int(match.group(1)) / 1e6)
+    return min(timings)
+
+
+@pytest.mark.parametrize('module', [
+    'enhancements.process',
+    'enhancements.returncode',
+    'enhancements.modules',
+    'enhancements.config',
+    'enhancements.plugins'
+])
+def test_import_time(benchmark_session, module):
+    benchmark_session.record('import[{}]'.format(module), import_time(module))
@@ -0,0 +1,22 @@
+# type: ignore
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """use a separate cache directory for each test"""
+    monkeypatch.setenv('ENHANCEMENTS_CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmark')
+    group.addoption(
+        '--benchmark', action='store_true', default=False,
+        help='run the benchmarks in tests/benchmarks (or set ENHANCEMENTS_BENCHMARK=1)'
+    )
+    group.addoption(
+        '--benchmark-update', action='store_true', default=False,
+        help='run the benchmarks and store the results as new baseline'
+    )
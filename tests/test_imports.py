@@ -0,0 +1,57 @@
+# type: ignore
+
+import json
+import os
+import subprocess  # nosec
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = ('argcomplete', 'asyncio', 'concurrent.futures', 'pickle', 'pkg_resources', 'typeguard')
+
+# modules, which must not be imported by a submodule of this package
+DEFERRED_IMPORTS = {
+    'enhancements.process': HEAVY_MODULES + ('enhancements.modules', 'pathlib'),
+    # Python 3.6 does not support module level __getattr__, so the config is imported by returncode
+    # hashlib and json are only needed for the cache of CONFIGFILE definitions and the ResultLog files
+    'enhancements.returncode': HEAVY_MODULES + (
+        ('enhancements.config', 'enhancements.modules', 'hashlib', 'json') if sys.version_info >= (3, 7) else ()
+    ),
+    'enhancements.modules': HEAVY_MODULES + ('shlex', 'queue'),
+    'enhancements.config': HEAVY_MODULES,
+}
+
+
+def loaded_modules(code, *modules, **env):
+    # the modules are checked before json is imported to print them
+    code = '\n'.join([
+        code,
+        'import sys',
+        'loaded = [m for m in {!r} if m in sys.modules]'.format(modules),
+        'import json',
+        'print(json.dumps(loaded))'
+    ])
+    output = subprocess.run(
+        [sys.executable, '-c', code], check=True, stdout=subprocess.PIPE, env=dict(os.environ, **env)
+    )  # nosec
+    return json.loads(output.stdout.decode())
+
+
+@pytest.mark.parametrize('module', sorted(DEFERRED_IMPORTS))
+def test_deferred_imports(module):
+    assert loaded_modules('import {}'.format(module), *DEFERRED_IMPORTS[module]) == []
+
+
+def test_deferred_imports_on_use():
+    # the deferred modules are imported by the code paths, which need them
+    code = '\n'.join([
+        'from enhancements import returncode',
+        'class ReturnCode(returncode.BaseReturnCode):',
+        '    Success = returncode.BaseReturnCode.Result("success", 10)',
+        'ReturnCode.min()',
+        'returncode.ExtendedConfigParser'
+    ])
+    assert loaded_modules(
+        code, 'typeguard', 'enhancements.config', ENHANCEMENTS_TYPECHECK='full'
+    ) == ['typeguard', 'enhancements.config']
@@ -1,20 +1,42 @@
 # type: ignore
 
+import argparse
+import asyncio
+import binascii
+import io
+import json
 import os
+import sys
+import threading
 from types import ModuleType
 import pytest
 
 from enhancements import examples
-from enhancements.examples import ExampleModule, HexDump
+from enhancements.examples import ExampleModule, HexDump, HexDumpRenderer
 from enhancements.exceptions import ModuleFromFileException
+from enhancements.plugins import LogModule
 from enhancements.modules import (
     BaseModule,
     _split_module_string,
     _load_module_from_string,
     _get_valid_module_class,
     get_module_class,
+    load_entry_point,
+    entry_point_index,
+    EntryPoint,
+    EntryPointIndex,
+    get_entry_point_description,
+    ImportlibMetadataBackend,
+    PkgResourcesBackend,
     ModuleParser,
-    ModuleError
+    ModuleResolver,
+    ModuleError,
+    ParserSnapshot,
+    CompletionIndex,
+    FileModuleCache,
+    Pipeline,
+    AsyncPipeline,
+    ProcessPoolModule
 )
 
 
@@ -135,6 +157,137 @@ def test_module():
     assert ExampleSubModule.config_section_name() == 'Examples:ExampleSubModule'
 
 
+def legacy_hexdump(data, hexwidth):
+    result = []
+    for i in range(0, len(data), hexwidth):
+        s = data[i:i + hexwidth]
+        hexa = list(map(''.join, zip(*[iter(binascii.hexlify(s).decode('utf-8'))] * 2)))
+        while hexwidth - len(hexa) > 0:
+            hexa.append(' ' * 2)
+        text = ''.join([chr(x) if 0x20 <= x < 0x7F else '.' for x in s])
+        result.append('%04X:    %s    %s' % (i, " ".join(hexa), text))
+    return '\n'.join(result) + '\n'
+
+
+@pytest.mark.parametrize('hexwidth', [1, 7, 16])
+def test_hexdump(capsys, hexwidth):
+    data = bytes(range(256)) * 3 + b'tail'
+    for length in (0, 1, hexwidth - 1, hexwidth, hexwidth + 1, len(data)):
+        assert HexDump(['--hexwidth', str(hexwidth)]).execute(data[:length]) == data[:length]
+        assert capsys.readouterr().out == legacy_hexdump(data[:length], hexwidth)
+
+    sink = io.StringIO()
+    hex_dump = HexDump(['--hexwidth', str(hexwidth)], sink=sink)
+    assert hex_dump.execute('text') == b'text'
+    assert sink.getvalue() == legacy_hexdump(b'text', hexwidth)
+    assert capsys.readouterr().out == ''
+
+    with pytest.raises(ValueError):
+        HexDumpRenderer(0)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_hexdump_file(tmp_path, workers, python36_process_pool):
+    data = bytes(range(256)) * 40 + b'tail'
+    path = tmp_path / 'capture.bin'
+    path.write_bytes(data)
+    hex_dump = HexDump(['--hexworkers', str(workers), '--hexaddress-width', '8'], sink=io.StringIO())
+
+    hex_dump.dump_file(str(path))
+    expected = HexDumpRenderer(address_width=8).render(data) + '\n'
+    assert hex_dump.sink.getvalue() == expected
+
+    # small chunks are rendered in order with global addresses
+    assert ''.join(chunk + '\n' for chunk in hex_dump.iter_file(str(path), chunk_lines=3)) == expected
+    chunks = list(hex_dump.iter_file(str(path), start=0x1000, length=0x20))
+    assert chunks == ['00001000:    00 01 02 03 04 05 06 07 08 09 0a 0b 0c 0d 0e 0f    ................\n'
+                      '00001010:    10 11 12 13 14 15 16 17 18 19 1a 1b 1c 1d 1e 1f    ................']
+    assert list(hex_dump.iter_file(str(path), start=len(data) - 2, length=100)) == [
+        '%08X:    69 6c%s    il' % (len(data) - 2, ' ' * 42)
+    ]
+    assert list(hex_dump.iter_file(str(path), start=len(data))) == []
+
+
+def test_hexdump_file_in_process(tmp_path, monkeypatch):
+    import concurrent.futures
+
+    def process_pool_not_allowed(*args, **kwargs):
+        raise AssertionError('small files must be rendered in process')
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', process_pool_not_allowed)
+    path = tmp_path / 'small.bin'
+    path.write_bytes(b'small file')
+    hex_dump = HexDump([], sink=io.StringIO())
+    hex_dump.dump_file(str(path))
+    assert hex_dump.sink.getvalue() == HexDumpRenderer().render(b'small file') + '\n'
+    # a single chunk does not need a process pool, even if more workers are requested
+    HexDump(['--hexworkers', '4'], sink=io.StringIO()).dump_file(str(path))
+
+
+def test_hexdump_negative_workers():
+    with pytest.raises(argparse.ArgumentTypeError):
+        examples._workers_argument('-1')
+    assert HexDump(['--hexworkers', '-1']).args.hexworkers is None
+    assert HexDump(['--hexworkers', '0']).args.hexworkers == 0
+
+
+def test_module_template():
+    class TemplateModule(BaseModule):
+        parse_count = 0
+
+        @classmethod
+        def parser_arguments(cls):
+            cls.parser().add_argument('--items', action='append', default=[])
+            cls.parser().add_argument('--name', default='template')
+            parse_known_args = cls.parser().parse_known_args
+
+            def count_parse_known_args(*args, **kwargs):
+                cls.parse_count += 1
+                return parse_known_args(*args, **kwargs)
+            cls.parser().parse_known_args = count_parse_known_args
+
+    first = TemplateModule(['--items', 'a'])
+    second = TemplateModule(['--items', 'a'], name='custom')
+    assert TemplateModule.parse_count == 1
+    assert TemplateModule.template(['--items', 'a']).values['items'] == ['a']
+    assert (first.args.items, first.args.name) == (['a'], 'template')
+    assert (second.args.items, second.args.name) == (['a'], 'custom')
+
+    # instances do not share mutable values
+    first.args.items.append('b')
+    assert second.args.items == ['a']
+    assert TemplateModule(['--items', 'a']).args.items == ['a']
+
+    # arguments added later create a new template
+    TemplateModule.parser().add_argument('--late', default=1, type=int)
+    assert TemplateModule(['--items', 'a']).args.late == 1
+    assert TemplateModule.parse_count == 2
+
+    with pytest.raises(KeyError):
+        TemplateModule([], missing_arg=1)
+    with pytest.raises(ValueError):
+        TemplateModule([], late='wrong_type')
+
+    # an explicit namespace is always parsed
+    namespace = argparse.Namespace(name='namespace')
+    assert TemplateModule(['--items', 'a'], namespace=namespace).args is namespace
+    assert namespace.name == 'namespace'
+    assert TemplateModule.parse_count == 4
+
+    # nested containers are copied, other objects like files are created for each instance
+    TemplateModule.parser().add_argument('--options', type=json.loads, default={'nested': []})
+    first = TemplateModule([])
+    first.args.options['nested'].append('b')
+    assert TemplateModule([]).args.options == {'nested': []}
+    assert TemplateModule.parse_count == 5
+    TemplateModule.parser().add_argument('--input', type=argparse.FileType('r'))
+    first, second = TemplateModule(['--input', __file__]), TemplateModule(['--input', __file__])
+    assert first.args.input is not second.args.input
+    assert not TemplateModule.template(['--input', __file__]).reusable
+    assert TemplateModule.parse_count == 8
+    first.args.input.close()
+    second.args.input.close()
+
+
 def test_sub_modules():
     HexDump.add_module(
         '--custom-module',
@@ -148,3 +301,460 @@ def test_sub_modules():
             default=ExampleSubModule,
             baseclass=1
         )
+
+
+def test_entry_point_index(cache_dir, monkeypatch):
+    # the first index scans the installed distributions and stores the result
+    index = EntryPointIndex()
+    assert 'console_scripts' in index.index
+    assert (cache_dir / EntryPointIndex.CACHEFILE).is_file()
+
+    # a new index uses the cache file without scanning
+    def scan_not_allowed(self):
+        raise AssertionError('entry points must be loaded from cache')
+    monkeypatch.setattr(EntryPointIndex, 'scan', scan_not_allowed)
+    assert EntryPointIndex().index.keys() == index.index.keys()
+
+    # a changed cache key invalidates the cache
+    monkeypatch.setattr(EntryPointIndex, 'cache_key', staticmethod(lambda: 'changed'))
+    with pytest.raises(AssertionError):
+        EntryPointIndex().index
+
+
+@pytest.mark.parametrize('backend', [ImportlibMetadataBackend, PkgResourcesBackend])
+def test_discovery_backend(backend):
+    index = EntryPointIndex(backend())
+    assert index.get('console_scripts', 'pytest').module_name == '_pytest.config'
+    assert index.resource_filename('enhancements', 'data/default.ini') == os.path.join(
+        os.path.dirname(examples.__file__), 'data', 'default.ini'
+    )
+
+
+@pytest.mark.parametrize('backend', [ImportlibMetadataBackend, PkgResourcesBackend])
+def test_resource_filename_without_location(backend, monkeypatch):
+    # e.g. __main__ of "python -c", a REPL or an embedded interpreter
+    monkeypatch.setitem(sys.modules, 'nolocation', ModuleType('nolocation'))
+    assert backend().resource_filename('nolocation', 'data/default.ini') == os.path.join('data', 'default.ini')
+
+    from enhancements.config import ExtendedConfigParser
+    monkeypatch.setattr(entry_point_index, 'backend', backend())
+    assert ExtendedConfigParser(package='nolocation', defaultini='missing.ini', ignore_missing_default_config=True)
+
+
+def test_load_entry_point(monkeypatch):
+    entry_point = EntryPoint('hexdump', 'ExampleModule', 'enhancements.examples:HexDump')
+    assert entry_point.module_name == 'enhancements.examples'
+    assert entry_point.load() is HexDump
+
+    monkeypatch.setattr(entry_point_index, '_index', {'ExampleModule': {'hexdump': entry_point}})
+    assert load_entry_point('ExampleModule', 'hexdump') is HexDump
+    assert load_entry_point('ExampleModule', 'enhancements.examples') is HexDump
+    assert load_entry_point('ExampleModule', 'missing') is None
+
+    parser = ModuleParser(baseclass=ExampleModule)
+    args = parser.parse_args(['-m', 'hexdump'])
+    assert args.modules[-1] is HexDump
+
+
+def test_module_help_without_import(tmp_path, monkeypatch):
+    plugin_package = tmp_path / 'lazyplugins'
+    plugin_package.mkdir()
+    (plugin_package / '__init__.py').write_text('raise ImportError("package must not be imported")\n')
+    (plugin_package / 'dump.py').write_text(
+        'from enhancements.examples import ExampleModule\n\n'
+        'class LazyDump(ExampleModule):\n'
+        '    """dump data without importing\n\n    more details\n    """\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    entry_point = EntryPoint('lazydump', 'ExampleModule', 'lazyplugins.dump:LazyDump')
+    assert get_entry_point_description(entry_point) == 'dump data without importing'
+    monkeypatch.setattr(entry_point_index, '_index', {'ExampleModule': {'lazydump': entry_point}})
+
+    parser = ModuleParser(baseclass=ExampleModule)
+    parser.parse_args([])
+    assert 'lazyplugins' not in sys.modules
+    assert '* lazydump -> dump data without importing' in parser.format_help()
+    assert 'lazyplugins' not in sys.modules
+
+
+def create_module_chain(depth):
+    class ChainModule(BaseModule):
+        parse_count = 0
+
+        @classmethod
+        def parser_arguments(cls):
+            parse_known_args = cls.parser().parse_known_args
+
+            def count_parse_known_args(*args, **kwargs):
+                cls.parse_count += 1
+                return parse_known_args(*args, **kwargs)
+            cls.parser().parse_known_args = count_parse_known_args
+
+    chain = [type('ChainModule{}'.format(level), (ChainModule, ), {}) for level in range(depth)]
+    for level, module in enumerate(chain[:-1]):
+        module.add_module(
+            '--level-{}'.format(level + 1),
+            dest='level_{}'.format(level + 1),
+            default=chain[level + 1],
+            baseclass=ChainModule
+        )
+    return ChainModule, chain
+
+
+def test_module_resolver():
+    baseclass, chain = create_module_chain(8)
+    parser = ModuleParser(default=chain[0], baseclass=baseclass, baseclass_as_default=False)
+    args = parser.parse_args([])
+    assert args.modules == [chain[0]]
+    assert args.level_7 is chain[7]
+
+    resolver = ModuleResolver(parser, [])
+    resolver.add(chain[0], baseclass)
+    assert resolver.resolve() == chain
+    assert [module_parser.description for module_parser in parser._module_parsers[1:]] == [m.__name__ for m in chain]
+    # each module parser is parsed once for each resolver
+    assert all(module.parse_count == 2 for module in chain)
+
+    # submodules must be subclasses of the baseclass
+    with pytest.raises(ModuleError):
+        parser.parse_args(['--level-7', 'enhancements.examples.HexDump'])
+
+
+def test_module_resolver_cycle():
+    baseclass, chain = create_module_chain(3)
+    chain[2].add_module('--level-0', dest='level_0', default=chain[0], baseclass=baseclass)
+    parser = ModuleParser(default=chain[0], baseclass=baseclass, baseclass_as_default=False)
+    with pytest.raises(ModuleError) as module_error:
+        parser.parse_args([])
+    assert module_error.value.message == 'cyclic module dependency: {} -> {} -> {} -> {}'.format(
+        *[module.__name__ for module in chain + chain[:1]]
+    )
+
+
+def test_startup_profiler(tmp_path, capsys, monkeypatch):
+    report_file = tmp_path / 'profile.json'
+    parser = ModuleParser(baseclass=ExampleModule, profile=str(report_file))
+    parser.add_plugin(LogModule)
+    parser.parse_args(['-m', 'enhancements.examples.HexDump'])
+    report = json.loads(report_file.read_text())
+    phases = ['entry_points', 'prefetch', 'parse', 'resolve', 'plugins', 'merge']
+    assert [phase['name'] for phase in report['phases']] == phases
+    assert report['total'] == pytest.approx(sum(phase['seconds'] for phase in report['phases']))
+    assert set(report['modules']['enhancements.examples:HexDump']) == {'import', 'parser_arguments', 'parse'}
+    assert set(report['modules']['enhancements.plugins:LogModule']) == {'parser_arguments', 'init'}
+    assert capsys.readouterr().err == ''
+
+    monkeypatch.setenv('ENHANCEMENTS_PROFILE', 'json')
+    ModuleParser(baseclass=ExampleModule).parse_args([])
+    assert [phase['name'] for phase in json.loads(capsys.readouterr().err)['phases']][0] == 'entry_points'
+
+    ModuleParser(baseclass=ExampleModule, profile='stderr').parse_args([])
+    assert capsys.readouterr().err.startswith('startup profile: ')
+
+
+def test_startup_profiler_imports(tmp_path, monkeypatch):
+    (tmp_path / 'slowimport.py').write_text('\n'.join([
+        'import time',
+        'from enhancements.examples import ExampleModule',
+        'time.sleep(0.05)',
+        'class SlowModule(ExampleModule):',
+        '    pass'
+    ]))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    report_file = tmp_path / 'profile.json'
+    parser = ModuleParser(baseclass=ExampleModule, profile=str(report_file))
+
+    # modules are imported by the argparse actions, the import time is recorded for the module
+    parser.parse_args(['-m', 'slowimport.SlowModule'])
+    report = json.loads(report_file.read_text())
+    assert report['modules']['slowimport:SlowModule']['import'] >= 0.05
+
+    # each report only contains the phases of one parser creation
+    parser.parse_args(['-m', 'slowimport.SlowModule'])
+    report = json.loads(report_file.read_text())
+    assert [phase['name'] for phase in report['phases']] == ['prefetch', 'parse', 'resolve', 'plugins', 'merge']
+    assert report['modules']['slowimport:SlowModule']['import'] < 0.05
+
+
+def test_parser_snapshot(cache_dir, monkeypatch):
+    argv = ['-m', 'enhancements.examples.HexDump', '--hexwidth', '8']
+    parser = ModuleParser(baseclass=ExampleModule, snapshot=True)
+    args = parser.parse_args(argv)
+    assert list((cache_dir / ParserSnapshot.CACHEDIR).iterdir())
+
+    # the second parser uses the snapshot instead of resolving the modules
+    def resolve_not_allowed(self):
+        raise AssertionError('modules must be loaded from snapshot')
+    monkeypatch.setattr(ModuleResolver, 'resolve', resolve_not_allowed)
+    parser = ModuleParser(baseclass=ExampleModule, snapshot=True)
+    assert parser.parse_args(argv) == args
+    assert parser.parse_args(['-m', 'enhancements.examples.HexDump', '--hexwidth', '4']).hexwidth == 4
+
+    # other modules or options are not in the snapshot
+    with pytest.raises(AssertionError):
+        parser.parse_args(['-m', 'enhancements.examples.HexDump', '-m', 'enhancements.examples.HexDump'])
+    with pytest.raises(AssertionError):
+        ModuleParser(baseclass=ExampleModule, snapshot=False).parse_args(argv)
+
+
+def test_parser_snapshot_abbreviation(cache_dir):
+    def parse(argv):
+        parser = ModuleParser(baseclass=ExampleModule, snapshot=True)
+        parser.add_module('--submodule', dest='submodule', default=HexDump, baseclass=ExampleModule)
+        return parser.parse_args(argv)
+
+    # abbreviated module options are not stored, because their values can not be compared
+    assert parse(['--sub', 'enhancements.examples.HexDump']).submodule is HexDump
+    assert not (cache_dir / ParserSnapshot.CACHEDIR).exists()
+    assert parse(['--sub', 'tests.test_modules.ExampleSubModule']).submodule is ExampleSubModule
+
+
+def test_completion_index(tmp_path, monkeypatch):
+    entry_point = EntryPoint('hexdump', 'ExampleModule', 'enhancements.examples:HexDump')
+    monkeypatch.setattr(entry_point_index, '_index', {'ExampleModule': {'hexdump': entry_point}})
+    ModuleParser(baseclass=ExampleModule, autocomplete=True, prog='hexdump').parse_args(['-m', 'hexdump'])
+    parser = ModuleParser(baseclass=ExampleModule, autocomplete=True, prog='hexdump')
+    parser.parse_args([])
+
+    # the options of a module are only completed, if the module is selected
+    completion_index = CompletionIndex(parser)
+    assert completion_index.complete('hexdump --hexwi', 15) is None
+    assert completion_index.complete('hexdump --h', 11) == ['--help']
+    assert completion_index.complete('hexdump -m hexdump --hexwi', 26) == ['--hexwidth']
+    assert completion_index.complete('hexdump --module=hexdump --h', 28) == [
+        '--help', '--hexaddress-width', '--hexwidth', '--hexworkers'
+    ]
+    assert completion_index.complete('hexdump -m ', 11) == ['hexdump']
+    assert completion_index.complete('hexdump -m hexdump --hexwidth ', 30) is None
+    # no index for other modules and abbreviated module options
+    assert completion_index.complete('hexdump -m other --h', 20) is None
+    assert completion_index.complete('hexdump --mod hexdump --h', 25) is None
+
+    # completion requests are answered without creating the parser
+    def create_parser_not_allowed(*args, **kwargs):
+        raise AssertionError('parser must not be created')
+
+    def completion_exit(status):
+        raise SystemExit(status)
+    monkeypatch.setattr(ModuleParser, '_create_parser', create_parser_not_allowed)
+    monkeypatch.setattr(os, '_exit', completion_exit)
+    monkeypatch.setenv('_ARGCOMPLETE', '1')
+    monkeypatch.setenv('COMP_LINE', 'hexdump -m hexdump --hexwi')
+    monkeypatch.setenv('COMP_POINT', '26')
+    monkeypatch.setenv('_ARGCOMPLETE_STDOUT_FILENAME', str(tmp_path / 'completions'))
+    with pytest.raises(SystemExit):
+        ModuleParser(baseclass=ExampleModule, autocomplete=True, prog='hexdump').parse_args()
+    assert (tmp_path / 'completions').read_text() == '--hexwidth'
+
+
+def test_file_module_cache(tmp_path):
+    module_file = tmp_path / 'filemodule.py'
+    module_file.write_text('VALUE = 1\n')
+    os.utime(module_file, ns=(1, 1))
+
+    file_module_cache = FileModuleCache()
+    module = file_module_cache.get(str(module_file))
+    assert module.VALUE == 1
+    assert sys.modules[FileModuleCache.module_name(str(module_file))] is module
+    assert file_module_cache.get(str(module_file)) is module
+
+    # without hot reload, changed files are not executed again
+    module_file.write_text('VALUE = 22\n')
+    assert file_module_cache.get(str(module_file)) is module
+
+    # with hot reload, only changed files are executed again
+    file_module_cache.hot_reload = True
+    reloaded_module = file_module_cache.get(str(module_file))
+    assert reloaded_module.VALUE == 22
+    assert file_module_cache.get(str(module_file)) is reloaded_module
+
+    # a broken file does not replace the loaded module
+    module_file.write_text('VALUE = \n')
+    assert file_module_cache.get(str(module_file)) is reloaded_module
+
+    file_module_cache.clear()
+    assert FileModuleCache.module_name(str(module_file)) not in sys.modules
+
+
+def test_module_prefetch(tmp_path, monkeypatch):
+    plugin_package = tmp_path / 'prefetchplugins'
+    plugin_package.mkdir()
+    (plugin_package / '__init__.py').write_text('')
+    for name in ('first', 'second'):
+        (plugin_package / '{}.py'.format(name)).write_text(
+            'import threading\n'
+            'from enhancements.examples import ExampleModule\n\n'
+            'IMPORT_THREAD = threading.current_thread().name\n\n'
+            'class Plugin(ExampleModule):\n'
+            '    pass\n'
+        )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    parser = ModuleParser(baseclass=ExampleModule, prefetch=True)
+    args = parser.parse_args(['-m', 'prefetchplugins.first.Plugin', '--module=prefetchplugins.second.Plugin'])
+    assert [module.__module__ for module in args.modules[1:]] == ['prefetchplugins.first', 'prefetchplugins.second']
+    assert set(parser.prefetcher.import_times) == {'prefetchplugins.first', 'prefetchplugins.second'}
+    assert sys.modules['prefetchplugins.first'].IMPORT_THREAD.startswith('ModulePrefetcher')
+    assert sys.modules['prefetchplugins.second'].IMPORT_THREAD.startswith('ModulePrefetcher')
+
+
+class UpperModule(ExampleModule):
+
+    def execute(self, data):
+        return data.upper()
+
+
+class CountModule(ExampleModule):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def execute(self, data):
+        with self.lock:
+            self.count += 1
+
+
+class NoExecuteModule(BaseModule):
+    pass
+
+
+class FailingModule(ExampleModule):
+
+    def execute(self, data):
+        raise RuntimeError('failed')
+
+
+@pytest.mark.parametrize('buffer_size', [0, 2])
+def test_pipeline(buffer_size):
+    pipeline = Pipeline([UpperModule, CountModule], args=[], buffer_size=buffer_size, chunk_size=4)
+    assert b''.join(pipeline.run(io.BytesIO(b'streaming data'))) == b'STREAMING DATA'
+    assert pipeline.modules[1].count == 4
+    assert [(stats.name, stats.chunks, stats.bytes) for stats in pipeline.stats] == [
+        ('UpperModule', 4, 14),
+        ('CountModule', 4, 14)
+    ]
+
+    # stop the pipeline before all chunks are processed
+    chunks = pipeline.run(iter([b'a'] * 100))
+    assert next(chunks) == b'A'
+    chunks.close()
+
+    with pytest.raises(RuntimeError):
+        Pipeline([FailingModule], args=[], buffer_size=buffer_size).process([b'data'])
+
+    with pytest.raises(ModuleError):
+        Pipeline([NoExecuteModule], args=[])
+
+
+class AsyncUpperModule(ExampleModule):
+
+    async def execute(self, data):
+        await asyncio.sleep(0)
+        return data.upper()
+
+
+class AsyncChunks():
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        await asyncio.sleep(0)
+        return self.chunks.pop(0)
+
+
+def test_async_pipeline():
+    pipeline = AsyncPipeline([AsyncUpperModule, CountModule], args=[])
+
+    async def collect(source):
+        return [chunk async for chunk in pipeline.run(source)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(collect(AsyncChunks([b'a', b'b']))) == [b'A', b'B']
+        assert loop.run_until_complete(collect(io.BytesIO(b'cd'))) == [b'CD']
+        loop.run_until_complete(pipeline.run_many([AsyncChunks([b'x'] * 10) for _ in range(20)]))
+    finally:
+        loop.close()
+    assert pipeline.modules[1].count == 203
+    assert [stats.chunks for stats in pipeline.stats] == [203, 203]
+
+
+class BlockingReader():
+
+    def __init__(self, event):
+        self.event = event
+        self.chunks = [b'sync']
+
+    def read(self, size):
+        # blocks until the other stream was processed, which is only possible, if the read does not block the event loop
+        if not self.chunks:
+            return b''
+        assert self.event.wait(5)
+        return self.chunks.pop()
+
+
+def test_async_pipeline_sync_source():
+    pipeline = AsyncPipeline([AsyncUpperModule], args=[])
+    event = threading.Event()
+
+    async def async_stream():
+        await pipeline.process(AsyncChunks([b'x']))
+        event.set()
+
+    async def run_streams():
+        await asyncio.gather(pipeline.process(BlockingReader(event)), async_stream())
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run_streams())
+    finally:
+        loop.close()
+    assert pipeline.stats[0].chunks == 2
+
+
+class PidModule(ExampleModule):
+
+    def execute(self, data):
+        return (data, os.getpid())
+
+
+@pytest.fixture
+def python36_process_pool(monkeypatch):
+    """ProcessPoolExecutor without the initializer arguments, which were added in Python 3.7"""
+    import concurrent.futures
+
+    class ProcessPoolExecutor(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, max_workers=None):
+            super().__init__(max_workers=max_workers)
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', ProcessPoolExecutor)
+
+
+def test_process_pool_module(python36_process_pool):
+    with ProcessPoolModule(UpperModule([]), processes=2) as module:
+        assert module.execute(b'data') == b'DATA'
+        assert list(module.map(b'%d' % i + b'x' for i in range(50))) == [b'%dX' % i for i in range(50)]
+
+        pipeline = Pipeline([module, CountModule], args=[], chunk_size=4)
+        pipeline.process(io.BytesIO(b"streaming data"))
+        assert pipeline.modules[1].count == 4
+        assert pipeline.stats[0].chunks == 4
+
+    with ProcessPoolModule(PidModule([]), processes=2) as module:
+        results = list(module.map(range(10)))
+    assert [data for data, _ in results] == list(range(10))
+    assert os.getpid() not in {pid for _, pid in results}
+
+    class LocalModule(ExampleModule):
+        pass
+
+    with pytest.raises(ModuleError):
+        ProcessPoolModule(LocalModule([]))
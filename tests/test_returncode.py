@@ -1,4 +1,13 @@
-from enhancements.returncode import BaseReturnCode, WrongResultSubclass, WrongResultValue
+import multiprocessing
+import operator
+import random
+import subprocess
+import sys
+import threading
+import types
+
+from enhancements import returncode
+from enhancements.returncode import BaseReturnCode, ResultHistogram, WrongResultSubclass, WrongResultValue
 import pytest  # type: ignore
 
 
@@ -131,8 +140,6 @@ def test_wrong_result_subclass():
 
 
 def test_lt_comperator():
-    import operator
-
     class CustomScanResult(BaseReturnCode):
         class Result(BaseReturnCode.Result):
             pass
@@ -143,3 +150,380 @@ def test_lt_comperator():
         Error = Result('error', 11)
 
     assert CustomScanResult.get_score(CustomScanResult.Success, CustomScanResult.Error) == CustomScanResult.Error
+
+
+def test_inherited_results():
+    class ParentResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('success', 10)
+        Error = BaseReturnCode.Result('error', 12)
+
+    class ChildResult(ParentResult):
+        Warning = BaseReturnCode.Result('Warning', 11)
+        Error = BaseReturnCode.Result('failed', 13)
+
+    assert sorted(ParentResult.get_results()) == [10, 12]
+    assert sorted(ChildResult.get_results()) == [10, 11, 13]
+    assert sorted(ChildResult.get_result_types()) == ['Warning', 'failed', 'success']
+    assert ChildResult.convert('WARNING') is ChildResult.Warning
+    assert ChildResult.convert('success') is ParentResult.Success
+    assert (ChildResult.min(), ChildResult.max()) == (10, 13)
+    with pytest.raises(ValueError):
+        ChildResult.convert(12)
+
+    # results, which are added later, are added to the lookup tables
+    ChildResult.Fatal = BaseReturnCode.Result('fatal', 20)
+    assert ChildResult.convert('fatal') is ChildResult.Fatal
+    assert ChildResult.max() == 20
+
+    with pytest.raises(TypeError):
+        ChildResult.get_results()[30] = ChildResult.Fatal
+
+    class EmptyResult(BaseReturnCode):
+        pass
+
+    with pytest.raises(ValueError):
+        EmptyResult.min()
+
+
+def test_result_comparison():
+    class ScanResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('success', 10)
+        Error = BaseReturnCode.Result('error', 12)
+
+    class OtherResult(BaseReturnCode):
+        class Result(BaseReturnCode.Result):
+            pass
+        Error = Result('failed', 12)
+
+    # results of the same class are compared without conversion
+    ScanResult.convert = None
+    assert ScanResult.Success < ScanResult.Error
+    assert ScanResult.Success != ScanResult.Error
+    del ScanResult.convert
+
+    assert ScanResult.Error == 12
+    assert ScanResult.Error == 'ERROR'
+    assert ScanResult.Error >= 'success'
+    # results of other classes are converted by value
+    assert ScanResult.Error == OtherResult.Error
+    with pytest.raises(ValueError):
+        assert ScanResult.Error == 'failed'
+
+
+@pytest.fixture(params=['numpy', 'builtin'])
+def bulk_backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(returncode, '_import_numpy', lambda: None)
+    return request.param
+
+
+@pytest.mark.parametrize('comperator', [operator.gt, operator.lt])
+def test_bulk_score(bulk_backend, comperator):
+    class ScanResult(BaseReturnCode):
+        COMPERATOR = comperator
+        Success = BaseReturnCode.Result('success', 10)
+        Skip = BaseReturnCode.Result('skip', 11, skip=True)
+        Warning = BaseReturnCode.Result('warning', 12)
+        Error = BaseReturnCode.Result('error', 13)
+
+    rand = random.Random(42)
+    for size in (0, 1, 5, 100):
+        codes = [rand.choice([10, 11, 12, 13]) for _ in range(size)]
+        expected = ScanResult.get_score(*[ScanResult.convert(code) for code in codes])
+        assert ScanResult.get_bulk_score(codes) is expected
+        assert ScanResult.get_bulk_score(iter(codes)) is expected
+    assert ScanResult.get_bulk_score([11, 11]) is ScanResult.get_score()
+
+    codes = [rand.choice([10, 11, 12, 13]) for _ in range(200)]
+    hosts = [rand.choice(['host1', 'host2', 'host3']) for _ in range(200)] + ['host4'] * 3
+    codes.extend([11, 11, 11])
+    scores = ScanResult.get_group_scores(codes, hosts)
+    assert scores == {
+        host: ScanResult.get_score(*[ScanResult.convert(code) for code, key in zip(codes, hosts) if key == host])
+        for host in set(hosts)
+    }
+    assert scores['host4'] is ScanResult.get_score()
+
+    with pytest.raises(ValueError):
+        ScanResult.get_bulk_score([10, 99])
+    with pytest.raises(ValueError):
+        ScanResult.get_group_scores([10, 99], ['host1', 'host2'])
+    with pytest.raises(ValueError):
+        ScanResult.get_group_scores([10, 12], ['host1'])
+
+    # keys, which can not be stored in a numpy array without changes, are grouped as they are
+    warning, error = ScanResult.get_score(ScanResult.Warning), ScanResult.get_score(ScanResult.Error)
+    assert ScanResult.get_group_scores([12, 12, 13], [('h1', 80), ('h1', 80), ('h1', 443)]) == {
+        ('h1', 80): warning,
+        ('h1', 443): error
+    }
+    assert ScanResult.get_group_scores([12, 13], ['a', 1]) == {'a': warning, 1: error}
+    assert ScanResult.get_group_scores([12, 13], [None, 'a']) == {None: warning, 'a': error}
+
+
+def test_bulk_score_numpy():
+    numpy = pytest.importorskip('numpy')
+
+    class ScanResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('success', 10)
+        Error = BaseReturnCode.Result('error', 13)
+
+    codes = numpy.array([10, 13, 10], dtype=numpy.int8)
+    assert ScanResult.get_bulk_score(codes) is ScanResult.Error
+    assert ScanResult.get_group_scores(codes, numpy.array([1, 1, 2])) == {1: ScanResult.Error, 2: ScanResult.Success}
+
+
+def test_result_accumulator():
+    class ScanResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('success', 10)
+        Skip = BaseReturnCode.Result('skip', 11, skip=True)
+        Warning = BaseReturnCode.Result('warning', 12)
+        Error = BaseReturnCode.Result('error', 13)
+
+    accumulator = ScanResult.accumulator()
+    assert accumulator.result is ScanResult.Success
+    assert accumulator.offer('skip') is False
+    assert accumulator.offer(12) is True
+    assert accumulator.offer(ScanResult.Success) is False
+
+    rand = random.Random(1)
+    values = [[rand.choice([10, 11, 12]) for _ in range(1000)] for _ in range(8)]
+    values[5][500] = 13
+    barrier = threading.Barrier(len(values))
+
+    def worker(worker_values):
+        barrier.wait()
+        for value in worker_values:
+            accumulator.offer(value)
+
+    threads = [threading.Thread(target=worker, args=(worker_values, )) for worker_values in values]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert accumulator.snapshot() is ScanResult.Error
+    # only the partial score of the main thread is left, the scores of the finished threads are merged
+    assert len(accumulator._partials) == 1
+
+    # short lived threads, e.g. a thread per connection, do not increase the number of partial scores
+    short_lived = ScanResult.accumulator()
+    for value in [12] + [10] * 199:
+        thread = threading.Thread(target=short_lived.offer, args=(value, ))
+        thread.start()
+        thread.join()
+    assert len(short_lived._partials) <= 1
+    assert short_lived.snapshot() is ScanResult.Warning
+    assert short_lived._partials == []
+
+    other = ScanResult.accumulator()
+    other.merge(accumulator)
+    assert other.result is ScanResult.Error
+
+    class OtherResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('success', 10)
+
+    with pytest.raises(ValueError):
+        OtherResult.accumulator().merge(accumulator)
+
+
+def count_results(histogram, worker, values):
+    for value in values:
+        histogram.add(value, worker=worker)
+
+
+ATTACH_HISTOGRAM = """
+import sys
+from multiprocessing import resource_tracker
+from enhancements.returncode import BaseReturnCode, ResultHistogram
+
+class ScanResult(BaseReturnCode):
+    Success = BaseReturnCode.Result('success', 10)
+    Skip = BaseReturnCode.Result('skip', 11, skip=True)
+    Warning = BaseReturnCode.Result('warning', 12)
+    Error = BaseReturnCode.Result('error', 13)
+
+with ResultHistogram(ScanResult, workers=3, name=sys.argv[1]) as histogram:
+    histogram.add('warning', worker=1)
+
+# wait for the resource tracker, which cleans up when this process exits
+resource_tracker._resource_tracker._stop()
+"""
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8) or sys.platform == 'win32', reason='requires shared memory and fork')
+def test_result_histogram():
+    class ScanResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('success', 10)
+        Skip = BaseReturnCode.Result('skip', 11, skip=True)
+        Warning = BaseReturnCode.Result('warning', 12)
+        Error = BaseReturnCode.Result('error', 13)
+
+    with ScanResult.histogram(workers=3) as histogram:
+        assert histogram.score() is ScanResult.Success
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=count_results, args=(histogram, worker, [10, 11, 12] * (worker + 1)))
+            for worker in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+        assert histogram.counts() == {ScanResult.Success: 6, ScanResult.Skip: 6, ScanResult.Warning: 6, ScanResult.Error: 0}
+        assert histogram.score() is ScanResult.Warning
+
+        # attach to the histogram by name
+        attached = ResultHistogram(ScanResult, workers=3, name=histogram.name)
+        attached.add('error', worker=2)
+        attached.close()
+        attached.close()
+        assert histogram.score() is ScanResult.Error
+
+        # a separately started process must not remove the shared memory, when it exits
+        subprocess.run([sys.executable, '-c', ATTACH_HISTOGRAM, histogram.name], check=True)
+        assert histogram.counts()[ScanResult.Warning] == 7
+        attached = ResultHistogram(ScanResult, workers=3, name=histogram.name)
+        attached.close()
+
+        with pytest.raises(IndexError):
+            histogram.add(10, worker=3)
+
+        # results, which were added after the histogram was created, and results of other classes
+        ScanResult.Fatal = ScanResult.Result('fatal', 20)
+
+        class OtherResult(BaseReturnCode):
+            Unknown = BaseReturnCode.Result('unknown', 30)
+
+        for value in (ScanResult.Fatal, 20, 'fatal', OtherResult.Unknown):
+            with pytest.raises(ValueError):
+                histogram.add(value)
+
+
+RETURNCODE_INI = """
+[Result]
+initial = success
+
+[Result:success]
+value = 10
+skip = False
+
+[Result:skip]
+value = 11
+skip = True
+
+[Result:{}]
+value = 12
+skip = False
+"""
+
+
+def test_configfile(tmp_path, monkeypatch):
+    (tmp_path / 'scanner' / 'data').mkdir(parents=True)
+    (tmp_path / 'scanner' / '__init__.py').write_text('')
+    configfile = tmp_path / 'scanner' / 'data' / 'returncode.ini'
+    configfile.write_text(RETURNCODE_INI.format('warning'))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    package = types.ModuleType('scanner')
+    package.__file__ = str(tmp_path / 'scanner' / '__init__.py')
+    monkeypatch.setitem(sys.modules, 'scanner', package)
+
+    from enhancements import config
+    parsed = []
+
+    class CountingConfigParser(config.ExtendedConfigParser):
+        def __init__(self, *args, **kwargs):
+            parsed.append(kwargs)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(config, 'ExtendedConfigParser', CountingConfigParser)
+
+    def returncode_class():
+        return type('ScanResult', (BaseReturnCode,), {'__module__': 'scanner.codes', 'CONFIGFILE': 'returncode.ini'})
+
+    # the config is loaded on first access
+    ScanResult = returncode_class()
+    assert parsed == []
+    assert ScanResult.Warning == 12
+    assert parsed == [{'defaultini': 'returncode.ini', 'package': 'scanner'}]
+    assert ScanResult.get_score(ScanResult.Skip) is ScanResult.Success
+    assert ScanResult.max() is ScanResult.Warning
+    assert ScanResult.warning().result is ScanResult.Warning
+
+    # the next class uses the cached definitions, the config is only parsed, when it is used
+    ScanResult = returncode_class()
+    assert ScanResult.convert('warning') is ScanResult.Warning
+    assert len(parsed) == 1
+    assert ScanResult.config.getint('Result:warning', 'value') == 12
+    assert len(parsed) == 2
+
+    # changes of the config file invalidate the cache
+    configfile.write_text(RETURNCODE_INI.format('error'))
+    ScanResult = returncode_class()
+    assert ScanResult.convert(12).string == 'error'
+    assert not hasattr(ScanResult, 'Warning')
+    assert len(parsed) == 3
+
+    # subclasses without a CONFIGFILE inherit the results
+    ScanResult = returncode_class()
+    SubResult = type('SubResult', (ScanResult,), {'CONFIGFILE': None, 'Fatal': ScanResult.Result('fatal', 20)})
+    assert [result.string for result in (SubResult.Success, SubResult.Error, SubResult.Fatal)] == ['success', 'error', 'fatal']
+    assert SubResult.config is ScanResult.config
+
+    # subclasses with their own CONFIGFILE load the results of the base classes first
+    (tmp_path / 'scanner' / 'data' / 'fatal.ini').write_text('[Result:fatal]\nvalue = 20\nskip = False\n')
+    ScanResult = returncode_class()
+    FatalResult = type('FatalResult', (ScanResult,), {'__module__': 'scanner.codes', 'CONFIGFILE': 'fatal.ini'})
+    assert FatalResult.max() is FatalResult.Fatal
+    assert FatalResult.convert('error') is ScanResult.Error
+    assert sorted(FatalResult.get_results()) == [10, 11, 12, 20]
+    assert FatalResult.get_score(FatalResult.Skip) is ScanResult.Success
+    assert ScanResult.max() is ScanResult.Error
+
+
+def test_result_log(tmp_path, bulk_backend):
+    class ScanResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('success', 10)
+        Skip = BaseReturnCode.Result('skip', 11, skip=True)
+        Warning = BaseReturnCode.Result('warning', 12)
+        Error = BaseReturnCode.Result('error', 13)
+
+    log = ScanResult.result_log([10, ScanResult.Skip, 'warning'])
+    log.append(ScanResult.Success)
+    assert log.typecode == 'b' and log.nbytes == 4
+    assert list(log) == [ScanResult.Success, ScanResult.Skip, ScanResult.Warning, ScanResult.Success]
+    assert log[2] is ScanResult.Warning
+    assert list(log[1:3]) == [ScanResult.Skip, ScanResult.Warning]
+    assert log.score() is ScanResult.Warning
+    assert log[:2].score() is ScanResult.Success
+    with log.memoryview() as view:
+        assert view.tolist() == [10, 11, 12, 10]
+    with pytest.raises(ValueError):
+        log.append(14)
+
+    # the array is extended, if a larger result is added to the class
+    ScanResult.Fatal = ScanResult.Result('fatal', 1000)
+    log.extend(log[:2])
+    log.append('fatal')
+    assert log.typecode == 'h'
+    assert log.score() is ScanResult.Fatal
+
+    path = str(tmp_path / 'results.log')
+    log.save(path)
+    loaded = returncode.ResultLog.load(ScanResult, path)
+    assert list(loaded) == list(log)
+    assert loaded.typecode == 'h'
+
+    class OtherResult(BaseReturnCode):
+        Success = BaseReturnCode.Result('ok', 10)
+
+    with pytest.raises(ValueError):
+        returncode.ResultLog.load(OtherResult, path)
+
+    # codes, which are not results of the class, are rejected
+    with open(path, 'ab') as logfile:
+        logfile.write((99).to_bytes(2, sys.byteorder))
+    with pytest.raises(ValueError):
+        returncode.ResultLog.load(ScanResult, path)
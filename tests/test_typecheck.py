@@ -0,0 +1,48 @@
+# type: ignore
+
+import pytest
+
+from enhancements import typecheck
+from enhancements.typecheck import typechecked, set_typecheck_mode
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+@pytest.fixture
+def typecheck_mode(monkeypatch):
+    monkeypatch.setattr(typecheck, '_mode', typecheck._mode)
+    monkeypatch.setattr(typecheck, '_sample_interval', typecheck._sample_interval)
+
+
+def test_typecheck_off(typecheck_mode):
+    set_typecheck_mode('off')
+    assert typechecked(add) is add
+
+
+def test_typecheck_full(typecheck_mode):
+    set_typecheck_mode('full')
+    checked_add = typechecked(add)
+    assert checked_add(1, 2) == 3
+    with pytest.raises(TypeError):
+        checked_add(1, '2')
+
+
+def test_typecheck_sampled(typecheck_mode):
+    set_typecheck_mode('sampled', 3)
+    sampled_add = typechecked(add)
+    # only the first of three calls is checked
+    with pytest.raises(TypeError):
+        sampled_add('1', '2')
+    assert sampled_add('1', '2') == '12'
+    assert sampled_add('1', '2') == '12'
+    with pytest.raises(TypeError):
+        sampled_add('1', '2')
+
+
+def test_invalid_typecheck_mode(typecheck_mode):
+    with pytest.raises(ValueError):
+        set_typecheck_mode('partial')
+    with pytest.raises(ValueError):
+        set_typecheck_mode('sampled', 0)